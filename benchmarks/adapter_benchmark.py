@@ -0,0 +1,233 @@
+"""
+Throughput, latency percentiles and memory of the adapter hot path, per cache backend.
+
+Synthetic updates from many users in many languages are fed to `handler_translator` and `dynamic_handler_translator`
+wrappers (plain and template) backed by a translator service that sleeps `--latency` seconds per call. The same
+seeded workload runs against every backend; a second, traced run measures the peak memory allocated. Without a cache
+the adapter sends messages untranslated, so "none" measures the adapter's own overhead. Run from the repository root:
+
+    python -m benchmarks.adapter_benchmark --updates 5000 --users 500 --caches none memory sqlite --output bench.json
+
+and compare a later run against saved results with `--baseline bench.json`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+from telegram import Chat, Message, Update, User
+
+from translategram.python_telegram_bot_translator.adapter import PythonTelegramBotAdapter
+from translategram.translategram.cache import (
+    AppendOnlyCache,
+    Cache,
+    MemoryCache,
+    PickleCache,
+    SQLiteCache,
+    TieredCache,
+)
+
+LANGUAGES = ["en", "es", "fr", "de", "pt-br", "it", "ru", "uk", "tr", "ja", "ko", "zh-hans"]
+MESSAGES = [
+    "Welcome! Use /help to see what this bot can do.",
+    "Your balance has been updated.",
+    "Sorry, something went wrong. Please try again later.",
+    "Your order is on its way.",
+]
+WORDS = ["order", "pizza", "refund", "delivery", "account", "password", "tomorrow", "thanks", "help", "status"]
+
+
+class LatencyTranslatorService:
+    """
+    Translator service standing in for the upstream, taking `latency` seconds per call.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def translate_str(self, text: str, target_language: str, source_language: str = "auto") -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"[{target_language}] {text}"
+
+
+class CacheData:
+    ...
+
+
+def _caches(directory: str) -> Dict[str, Callable[[], Union[Cache, None]]]:
+    return {
+        "none": lambda: None,
+        "memory": lambda: MemoryCache(),
+        "pickle": lambda: PickleCache(CacheData(), filename=os.path.join(directory, "translation.data")),
+        "append-only": lambda: AppendOnlyCache(filename=os.path.join(directory, "translation.log")),
+        "sqlite": lambda: SQLiteCache(filename=os.path.join(directory, "translation.sqlite3")),
+        "tiered": lambda: TieredCache(
+            MemoryCache(), SQLiteCache(filename=os.path.join(directory, "tiered.sqlite3"))
+        ),
+    }
+
+
+def fake_updates(count: int, users: int, seed: int = 0) -> List[Tuple[str, Update, SimpleNamespace]]:
+    """
+    Build a reproducible stream of `(handler, update, context)` triples from `users` users, each with a fixed
+    client language. Half of the updates hit a static handler, the rest a dynamic or template handler with a short
+    random user input.
+    """
+    rng = random.Random(seed)
+    people = [
+        User(id=user_id, first_name=f"User {user_id}", is_bot=False, language_code=rng.choice(LANGUAGES))
+        for user_id in range(1, users + 1)
+    ]
+    updates = []
+    for update_id in range(count):
+        user = rng.choice(people)
+        message = Message(update_id, datetime.now(), Chat(user.id, Chat.PRIVATE), from_user=user)
+        handler = rng.choices(["static", "dynamic", "template"], weights=[2, 1, 1])[0]
+        args = rng.sample(WORDS, rng.randint(1, 3)) if handler != "static" else []
+        updates.append((handler, Update(update_id, message=message), SimpleNamespace(args=args)))
+    return updates
+
+
+def _handlers(adapter: PythonTelegramBotAdapter, rng: random.Random) -> Dict[str, Callable[[Any, Any], Any]]:
+    async def reply(update: Update, context: Any, message: str) -> str:
+        return message
+
+    static: List[Callable[..., Awaitable[Any]]] = [
+        adapter.handler_translator(message, source_lang="en")(reply) for message in MESSAGES
+    ]
+
+    async def static_handler(update: Update, context: Any) -> Any:
+        return await rng.choice(static)(update, context)
+
+    def build_message(user_input: str, update: Update) -> str:
+        return f"You asked about {user_input}."
+
+    def build_values(user_input: str, update: Update) -> Dict[str, str]:
+        return {"topic": user_input}
+
+    return {
+        "static": static_handler,
+        "dynamic": adapter.dynamic_handler_translator(build_message, source_lang="en")(reply),
+        "template": adapter.dynamic_handler_translator(
+            build_values,
+            source_lang="en",
+            template="We are looking into your question about {topic}.",
+        )(reply),
+    }
+
+
+async def _drive(
+    cache: Union[Cache, None],
+    updates: List[Tuple[str, Update, SimpleNamespace]],
+    latency: float,
+    concurrency: int,
+    seed: int,
+) -> Tuple[List[float], float, int]:
+    adapter = PythonTelegramBotAdapter(lambda: LatencyTranslatorService(latency), cache)  # type: ignore
+    handlers = _handlers(adapter, random.Random(seed))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def handle(handler: str, update: Update, context: SimpleNamespace) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await handlers[handler](update, context)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handle(*update) for update in updates))
+    elapsed = time.perf_counter() - start
+    calls = adapter._translator_service.calls  # type: ignore
+    await adapter.aclose()
+    return latencies, elapsed, calls
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    updates = fake_updates(args.updates, args.users, args.seed)
+    results: Dict[str, Any] = {}
+    for name in args.caches:
+        with tempfile.TemporaryDirectory() as directory:
+            latencies, elapsed, calls = await _drive(
+                _caches(directory)[name](), updates, args.latency, args.concurrency, args.seed
+            )
+        peak_memory = None
+        if not args.no_memory:
+            with tempfile.TemporaryDirectory() as directory:
+                tracemalloc.start()
+                await _drive(_caches(directory)[name](), updates, args.latency, args.concurrency, args.seed)
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        results[name] = {
+            "throughput": len(updates) / elapsed,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "upstream_calls": calls,
+            "peak_memory": peak_memory,
+        }
+        print(
+            f"{name:>12}: {results[name]['throughput']:9.1f} updates/s  "
+            f"p50 {results[name]['p50'] * 1e3:8.2f}ms  p95 {results[name]['p95'] * 1e3:8.2f}ms  "
+            f"p99 {results[name]['p99'] * 1e3:8.2f}ms  {calls:6} upstream calls"
+            + (f"  peak {peak_memory / 2 ** 20:7.1f}MiB" if peak_memory is not None else "")
+        )
+    return results
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--caches", nargs="+", choices=sorted(_caches("")), default=["none", "memory", "sqlite"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run measuring peak memory")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with those saved in this JSON file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_run(args))
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        for name in results.keys() & baseline.keys():
+            print(
+                f"{name:>12} vs baseline: throughput "
+                f"{results[name]['throughput'] / baseline[name]['throughput'] - 1:+7.1%}  p95 "
+                f"{results[name]['p95'] / baseline[name]['p95'] - 1:+7.1%}"
+            )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "benchmark": "adapter",
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "parameters": {
+                        key: value for key, value in vars(args).items() if key not in ("output", "baseline")
+                    },
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Round-trips and time of `HttpTranslatorService.translate_batch` vs. one `translate_str` call per segment.
+
+Both run against a local fake translation server with artificial latency. Run from the repository root:
+
+    python -m benchmarks.batch_translation_benchmark --segments 40 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Union
+
+from tests.fake_server import FakeTranslationServer
+from translategram.translategram.translator_services import HttpTranslatorService
+
+
+async def _run(base_url: str, server: FakeTranslationServer, texts: List[str], batch: bool) -> None:
+    service = HttpTranslatorService(base_url=base_url, max_connections=1)
+    server.requests = 0
+    start = time.perf_counter()
+    if batch:
+        await service.translate_batch(texts, "es", "en")
+    else:
+        await asyncio.gather(*(service.translate_str(text, "es", "en") for text in texts))
+    elapsed = time.perf_counter() - start
+    await service.aclose()
+    label = "translate_batch" if batch else "translate_str"
+    print(f"{label:>15}: {len(texts)} segments, {server.requests} requests in {elapsed:.3f}s")
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    texts = [f"Menu entry number {i}" for i in range(args.segments)]
+    with FakeTranslationServer(latency=args.latency) as server:
+        for batch in (False, True):
+            asyncio.run(_run(server.base_url, server, texts, batch))
+
+
+if __name__ == "__main__":
+    main()
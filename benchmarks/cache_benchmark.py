@@ -0,0 +1,82 @@
+"""
+Per-operation cost of `PickleCache` vs. `AppendOnlyCache` as the cache grows.
+
+Each cache is prefilled to the given size, then timed over a fixed number of stores and retrieves. Run from the
+repository root:
+
+    python -m benchmarks.cache_benchmark --sizes 10000 100000 1000000 --ops 200
+"""
+import argparse
+import asyncio
+import os
+import pickle
+import tempfile
+import time
+from typing import List, Tuple, Union
+
+from translategram.translategram.cache import AppendOnlyCache, PickleCache
+
+
+class CacheData:
+    ...
+
+
+def _prefilled_pickle_cache(directory: str, size: int) -> PickleCache:
+    obj = CacheData()
+    for i in range(size):
+        setattr(obj, f"key{i}", f"value{i}")
+    cache = PickleCache(CacheData(), filename=os.path.join(directory, "translation.data"))
+    cache._obj = obj
+    with open(cache.pickle_file, "wb") as file:
+        pickle.dump(obj, file)
+    return cache
+
+
+async def _prefilled_append_only_cache(directory: str, size: int) -> AppendOnlyCache:
+    cache = AppendOnlyCache(filename=os.path.join(directory, "translation.log"))
+    for i in range(size):
+        await cache.store(f"key{i}", f"value{i}")
+    return cache
+
+
+async def _time(cache: Union[PickleCache, AppendOnlyCache], size: int, ops: int) -> Tuple[float, float]:
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.store(f"new{i}", f"value{i}")
+    store = (time.perf_counter() - start) / ops
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.retrieve(f"key{i * 7919 % size}")
+    retrieve = (time.perf_counter() - start) / ops
+    return store, retrieve
+
+
+async def _run(sizes: List[int], ops: int) -> None:
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            pickle_cache = _prefilled_pickle_cache(directory, size)
+            append_only_cache = await _prefilled_append_only_cache(directory, size)
+            caches: Tuple[Tuple[str, Union[PickleCache, AppendOnlyCache]], ...] = (
+                ("PickleCache", pickle_cache),
+                ("AppendOnlyCache", append_only_cache),
+            )
+            for name, cache in caches:
+                store, retrieve = await _time(cache, size, ops)
+                print(
+                    f"{name:>15} @ {size:>8} entries: "
+                    f"store {store * 1e6:10.1f}us  retrieve {retrieve * 1e6:10.1f}us"
+                )
+            append_only_cache.close()
+            del pickle_cache
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args(argv)
+    asyncio.run(_run(args.sizes, args.ops))
+
+
+if __name__ == "__main__":
+    main()
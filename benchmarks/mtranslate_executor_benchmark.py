@@ -0,0 +1,50 @@
+"""
+Update throughput of `MtranslateTranslatorService` inline vs. on a thread pool.
+
+`mtranslate` has its endpoint hard-coded, so the benchmark routes it through a local fake server acting as an
+HTTP proxy. Run from the repository root:
+
+    python -m benchmarks.mtranslate_executor_benchmark --updates 64 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import List, Union
+
+from tests.fake_server import FakeTranslationServer
+from translategram.translategram.translator_services import MtranslateTranslatorService
+
+
+async def _run(service: MtranslateTranslatorService, updates: int) -> float:
+    async def handle_update(i: int) -> str:
+        return await service.translate_str(f"message {i}", "es", "en")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handle_update(i) for i in range(updates)))
+    return time.perf_counter() - start
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 16, 32])
+    args = parser.parse_args(argv)
+
+    with FakeTranslationServer(latency=args.latency) as server:
+        os.environ["http_proxy"] = server.base_url
+        modes: List[Union[int, None]] = [None, *args.workers]
+        for workers in modes:
+            service = MtranslateTranslatorService(max_workers=workers)
+            elapsed = asyncio.run(_run(service, args.updates))
+            service.close()
+            label = "inline" if workers is None else f"{workers} workers"
+            print(
+                f"{label:>12}: {args.updates} updates in {elapsed:.3f}s "
+                f"({args.updates / elapsed:.1f} updates/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Time to first chunk of `stream_translation` vs. translating a long message in one request.
+
+The local fake translation server's latency grows with the length of the text, like a real translation endpoint.
+Run from the repository root:
+
+    python -m benchmarks.streaming_translation_benchmark --paragraphs 12 --latency-per-char 0.0005
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Union
+
+from tests.fake_server import FakeTranslationServer
+from translategram.translategram.streaming import stream_translation
+from translategram.translategram.translator_services import HttpTranslatorService
+
+PARAGRAPH = (
+    "This bot answers questions about your account. Use /balance to see what you owe. "
+    "Use /history to list your last payments, and /help to get this message again."
+)
+
+
+async def _run(base_url: str, text: str, max_chunk_chars: int, max_concurrency: int) -> None:
+    service = HttpTranslatorService(base_url=base_url, max_connections=max_concurrency)
+
+    start = time.perf_counter()
+    await service.translate_str(text, "es", "en")
+    whole = time.perf_counter() - start
+    print(f"{'one request':>12}: first text after {whole:.3f}s, complete after {whole:.3f}s")
+
+    start = time.perf_counter()
+    first: Union[float, None] = None
+    async for _ in stream_translation(
+        text,
+        lambda chunk: service.translate_str(chunk, "es", "en"),
+        max_chunk_chars=max_chunk_chars,
+        max_concurrency=max_concurrency,
+    ):
+        if first is None:
+            first = time.perf_counter() - start
+    print(f"{'streamed':>12}: first text after {first or 0:.3f}s, complete after {time.perf_counter() - start:.3f}s")
+    await service.aclose()
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--latency-per-char", type=float, default=0.0005)
+    parser.add_argument("--max-chunk-chars", type=int, default=400)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    text = "\n\n".join([PARAGRAPH] * args.paragraphs)
+    with FakeTranslationServer(latency=args.latency, latency_per_char=args.latency_per_char) as server:
+        asyncio.run(_run(server.base_url, text, args.max_chunk_chars, args.max_concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-call overhead of the `handler_translator` and `dynamic_handler_translator` wrappers on a warm cache.
+
+The translator service answers instantly and every translation is cached before timing, so what is left is the
+work the wrappers do per update. Run from the repository root, e.g. on two commits to compare them:
+
+    python -m benchmarks.wrapper_overhead_benchmark --calls 100000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, List, Union
+
+from telegram import Chat, Message, Update, User
+
+from translategram.python_telegram_bot_translator.adapter import PythonTelegramBotAdapter
+from translategram.translategram.cache import MemoryCache
+
+
+class InstantTranslatorService:
+    async def translate_str(self, text: str, target_language: str, source_language: str = "auto") -> str:
+        return f"[{target_language}] {text}"
+
+
+async def _time(name: str, wrapper: Callable[..., Awaitable[Any]], update: Update, calls: int) -> None:
+    context = SimpleNamespace(args=["pizza"])
+    await wrapper(update, context)
+    start = time.perf_counter()
+    for _ in range(calls):
+        await wrapper(update, context)
+    print(f"{name:>24}: {(time.perf_counter() - start) / calls * 1e6:8.2f}us per call")
+
+
+async def _run(calls: int) -> None:
+    adapter = PythonTelegramBotAdapter(InstantTranslatorService, MemoryCache())  # type: ignore
+    user = User(id=1, first_name="User", is_bot=False, language_code="fr")
+    update = Update(1, message=Message(1, datetime.now(), Chat(1, Chat.PRIVATE), from_user=user))
+
+    async def async_handler(update: Update, context: Any, message: str) -> str:
+        return message
+
+    def sync_handler(update: Update, context: Any, message: str) -> str:
+        return message
+
+    def build_message(user_input: str, update: Update) -> str:
+        return f"You asked about {user_input}."
+
+    await _time("handler (async)", adapter.handler_translator("Hello World", "en")(async_handler), update, calls)
+    await _time("handler (sync)", adapter.handler_translator("Hello World", "en")(sync_handler), update, calls)
+    await _time(
+        "dynamic handler", adapter.dynamic_handler_translator(build_message, "en")(async_handler), update, calls
+    )
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
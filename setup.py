@@ -14,10 +14,16 @@ setup(
     install_requires=[
         "mtranslate",
     ],
+    extras_require={
+        "httpx": ["httpx"],
+    },
+    entry_points={
+        "console_scripts": ["translategram-catalog=translategram.translategram.catalog:main"],
+    },
     include_package_data=True,
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=find_packages(exclude=["tests", "tests.*", "*.tests", "*.tests.*"]),
+    packages=find_packages(exclude=["tests", "tests.*", "*.tests", "*.tests.*", "benchmarks", "benchmarks.*"]),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -1,7 +1,8 @@
 import asyncio
 from pathlib import Path
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 import os
+import time
 from typing import Any, Callable, Coroutine, Type
 from unittest.mock import MagicMock
 import pytest
@@ -11,12 +12,14 @@ from translategram.translategram.translator import Translator
 from translategram.translategram.translator_services import (
     TranslatorService,
     MtranslateTranslatorService,
+    HttpTranslatorService,
 )
 from translategram.translategram.service_libs import mtranslate
 from translategram.python_telegram_bot_translator.adapter import (
     PythonTelegramBotAdapter,
 )
-from translategram.translategram.cache import PickleCache
+from translategram.translategram.cache import AppendOnlyCache, PickleCache
+from tests.fake_server import FakeTranslationServer
 
 
 class CacheData:
@@ -31,6 +34,13 @@ def cache(tmp_path: Path) -> Generator:
     os.remove(cache.pickle_file)
 
 
+@pytest.fixture
+def append_only_cache(tmp_path: Path) -> Generator:
+    cache = AppendOnlyCache(filename=str(tmp_path / "translation.log"))
+    yield cache
+    cache.close()
+
+
 @pytest.fixture
 def event_loop() -> Generator:
     loop = asyncio.get_event_loop_policy().new_event_loop()
@@ -109,3 +119,58 @@ def async_translate_function() -> Callable[[str], Coroutine[Any, Any, str]]:
         return "Less than 10"
 
     return tr_func
+
+
+class BlockingMtranslate:
+    """
+    Stand-in for the `mtranslate` module whose `translate` blocks like the real HTTP call.
+    """
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.running = 0
+        self.max_running = 0
+
+    def translate(
+        self, to_translate: str, to_language: str = "auto", from_language: str = "auto"
+    ) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        time.sleep(self.latency)
+        self.running -= 1
+        return f"{to_language}:{to_translate}"
+
+
+class FakeClock:
+    """
+    Monotonic clock stand-in that only moves when a test sets `now`.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def blocking_mtranslate() -> BlockingMtranslate:
+    return BlockingMtranslate()
+
+
+@pytest.fixture
+def fake_translation_server() -> Generator:
+    with FakeTranslationServer() as server:
+        yield server
+
+
+@pytest.fixture
+async def http_service(fake_translation_server: FakeTranslationServer) -> AsyncGenerator:
+    service = HttpTranslatorService(base_url=fake_translation_server.base_url)
+    yield service
+    await service.aclose()
@@ -0,0 +1,115 @@
+"""
+A local stand-in for the Google-translate mobile endpoint, used by the tests and the benchmarks.
+
+It answers `GET /m?tl=<target>&sl=<source>&q=<text>` with the same HTML shape `mtranslate` parses, or with an error
+when the `translate` callable raises: the status of a `FakeHTTPError`, or 500 for anything else. It also works
+as an HTTP proxy, so `mtranslate` (which has its endpoint hard-coded) can be pointed at it through `http_proxy`.
+"""
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Union
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeHTTPError(Exception):
+    """
+    Raised by a `translate` callable to answer with a specific status code and headers.
+    """
+
+    def __init__(self, status: int, headers: Union[Dict[str, str], None] = None) -> None:
+        super().__init__(status)
+        self.status = status
+        self.headers = headers or {}
+
+
+def upper_translation(text: str, target_language: str, source_language: str) -> str:
+    return text.upper()
+
+
+class FakeTranslationServer:
+    """
+    Threaded fake translation server with artificial latency, fixed or growing with the length of the text.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        translate: Callable[[str, str, str], str] = upper_translation,
+        latency_per_char: float = 0.0,
+    ) -> None:
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.translate = translate
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Union[threading.Thread, None] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                query = parse_qs(urlsplit(self.path).query)
+                text = query.get("q", [""])[0]
+                if server.latency or server.latency_per_char:
+                    time.sleep(server.latency + server.latency_per_char * len(text))
+                target = query.get("tl", ["auto"])[0]
+                source = query.get("sl", ["auto"])[0]
+                headers: Dict[str, str] = {}
+                try:
+                    translated = server.translate(text, target, source)
+                    status = 200
+                except FakeHTTPError as exc:
+                    translated, status, headers = "", exc.status, exc.headers
+                except Exception:
+                    translated, status = "", 500
+                body = (
+                    '<html><body><div class="result-container">'
+                    f"{html.escape(translated, quote=False)}</div></body></html>"
+                ).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeTranslationServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeTranslationServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
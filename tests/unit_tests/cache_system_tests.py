@@ -1,6 +1,19 @@
 import os
+import threading
+import time
 from pathlib import Path
-from translategram.translategram.cache import Cache
+import asyncio
+import pytest
+from translategram.translategram.cache import (
+    AppendOnlyCache,
+    BundleCache,
+    Cache,
+    MemoryCache,
+    SQLiteCache,
+    TieredCache,
+    make_cache_key,
+    write_bundle,
+)
 
 
 def cache_initialization_with_default_name_test(cache: Cache, tmp_path: Path) -> None:
@@ -56,3 +69,450 @@ async def store_and_retrieve_multiple_values_test(cache: Cache) -> None:
     assert result1 == "value1"
     assert result2 == "value2"
     assert result3 == "value3"
+
+
+async def append_only_store_and_retrieve_test(append_only_cache: AppendOnlyCache) -> None:
+    await append_only_cache.store("key1", "value1")
+    await append_only_cache.store("key2", "välue2")
+
+    assert await append_only_cache.retrieve("key1") == "value1"
+    assert await append_only_cache.retrieve("key2") == "välue2"
+    assert await append_only_cache.retrieve("nonexistent_key") is None
+
+
+async def append_only_overwrite_returns_latest_value_test(
+    append_only_cache: AppendOnlyCache,
+) -> None:
+    await append_only_cache.store("key", "old")
+    await append_only_cache.store("key", "new")
+
+    assert await append_only_cache.retrieve("key") == "new"
+    assert len(append_only_cache) == 1
+
+
+async def append_only_recovers_index_on_startup_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    cache = AppendOnlyCache(filename=filename)
+    await cache.store("key1", "value1")
+    await cache.store("key1", "value2")
+    await cache.store("key2", "value3")
+    cache.close()
+
+    reopened = AppendOnlyCache(filename=filename)
+    assert await reopened.retrieve("key1") == "value2"
+    assert await reopened.retrieve("key2") == "value3"
+    reopened.close()
+
+
+async def append_only_truncates_torn_tail_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    cache = AppendOnlyCache(filename=filename)
+    await cache.store("key1", "value1")
+    await cache.store("key2", "value2")
+    cache.close()
+    intact_size = os.path.getsize(filename)
+    with open(filename, "ab") as file:
+        file.write(b"\x00\x00\x00\x04\x00\x00\x00\x09\x00\x00\x00\x00ke")
+
+    reopened = AppendOnlyCache(filename=filename)
+    assert await reopened.retrieve("key1") == "value1"
+    assert await reopened.retrieve("key2") == "value2"
+    assert os.path.getsize(filename) == intact_size
+    await reopened.store("key3", "value3")
+    reopened.close()
+
+    recovered = AppendOnlyCache(filename=filename)
+    assert await recovered.retrieve("key3") == "value3"
+    recovered.close()
+
+
+async def append_only_compaction_drops_stale_entries_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    cache = AppendOnlyCache(filename=filename, compact_threshold=None)
+    for i in range(100):
+        await cache.store("key", f"value{i}")
+    await cache.store("other", "value")
+    size_before = os.path.getsize(filename)
+
+    cache.compact()
+
+    assert os.path.getsize(filename) < size_before
+    assert await cache.retrieve("key") == "value99"
+    assert await cache.retrieve("other") == "value"
+    cache.close()
+
+
+async def append_only_compacts_automatically_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    cache = AppendOnlyCache(filename=filename, compact_threshold=0.5)
+    for i in range(100):
+        await cache.store("key", f"value{i}")
+
+    assert os.path.getsize(filename) < 100 * len("keyvalue00")
+    assert await cache.retrieve("key") == "value99"
+    cache.close()
+
+
+async def append_only_stores_off_the_event_loop_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    cache = AppendOnlyCache(filename=filename, compact_threshold=0.5, fsync=True)
+    append = cache._append
+    cache._append = lambda record: (time.sleep(0.01), append(record))  # type: ignore
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.ensure_future(tick())
+    await asyncio.gather(*(cache.store(f"key{i % 5}", f"value{i}") for i in range(20)))
+    ticker.cancel()
+
+    assert ticks >= 20
+    assert [await cache.retrieve(f"key{i}") for i in range(5)] == [f"value{15 + i}" for i in range(5)]
+    cache.close()
+    reopened = AppendOnlyCache(filename=filename)
+    assert sorted(await reopened.items()) == [(f"key{i}", f"value{15 + i}") for i in range(5)]
+    reopened.close()
+
+
+async def memory_store_and_retrieve_test() -> None:
+    cache = MemoryCache()
+    await cache.store("key1", "value1")
+
+    assert await cache.retrieve("key1") == "value1"
+    assert await cache.retrieve("nonexistent_key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def memory_evicts_least_recently_used_test() -> None:
+    cache = MemoryCache(max_entries=2)
+    await cache.store("key1", "value1")
+    await cache.store("key2", "value2")
+    await cache.retrieve("key1")
+    await cache.store("key3", "value3")
+
+    assert await cache.retrieve("key2") is None
+    assert await cache.retrieve("key1") == "value1"
+    assert await cache.retrieve("key3") == "value3"
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+async def memory_bounds_size_in_bytes_test() -> None:
+    cache = MemoryCache(max_entries=None, max_bytes=25)
+    await cache.store("key1", "value1")
+    await cache.store("key2", "value2")
+    await cache.store("key3", "v3")
+    await cache.store("key4", "ä" * 30)
+
+    assert cache.size == 16
+    assert await cache.retrieve("key1") is None
+    assert await cache.retrieve("key4") is None
+    assert await cache.retrieve("key2") == "value2"
+    assert await cache.retrieve("key3") == "v3"
+
+
+async def memory_overwrite_updates_size_test() -> None:
+    cache = MemoryCache()
+    await cache.store("key", "short")
+    await cache.store("key", "much longer")
+
+    assert cache.size == len("key") + len("much longer")
+    assert await cache.retrieve("key") == "much longer"
+
+
+async def memory_expires_entries_test(fake_clock) -> None:
+    cache = MemoryCache(ttl=10, clock=fake_clock)
+    await cache.store("key1", "value1")
+    await cache.store("key2", "value2", ttl=100)
+    fake_clock.now = 50
+
+    assert await cache.retrieve("key1") is None
+    assert await cache.retrieve("key2") == "value2"
+    assert cache.expirations == 1
+    assert len(cache) == 1
+
+
+async def tiered_store_writes_behind_test() -> None:
+    back = MemoryCache()
+    cache = TieredCache(MemoryCache(), back, flush_interval=0.01)
+    await cache.store("key", "value")
+
+    assert await cache.retrieve("key") == "value"
+    assert len(back) == 0
+    await asyncio.sleep(0.05)
+    assert await back.retrieve("key") == "value"
+    await cache.aclose()
+
+
+async def tiered_flushes_full_batch_early_test() -> None:
+    back = MemoryCache()
+    cache = TieredCache(MemoryCache(), back, flush_interval=60, batch_size=3)
+    for i in range(3):
+        await cache.store(f"key{i}", f"value{i}")
+    await asyncio.sleep(0.01)
+
+    assert len(back) == 3
+    await cache.aclose()
+
+
+async def tiered_promotes_back_hits_test() -> None:
+    front = MemoryCache()
+    back = MemoryCache()
+    await back.store("key", "value")
+    cache = TieredCache(front, back)
+
+    assert await cache.retrieve("key") == "value"
+    assert await front.retrieve("key") == "value"
+    assert await cache.retrieve("nonexistent_key") is None
+
+
+async def tiered_retrieves_pending_entries_evicted_from_front_test() -> None:
+    back = MemoryCache()
+    cache = TieredCache(MemoryCache(max_entries=1), back, flush_interval=60)
+    await cache.store("key1", "value1")
+    await cache.store("key2", "value2")
+
+    assert await cache.retrieve("key1") == "value1"
+    await cache.aclose()
+
+
+async def tiered_close_flushes_pending_writes_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.log")
+    back = AppendOnlyCache(filename=filename)
+    cache = TieredCache(MemoryCache(), back, flush_interval=60)
+    await cache.store("key", "value")
+    await cache.aclose()
+
+    assert back._file.closed
+    reopened = AppendOnlyCache(filename=filename)
+    assert await reopened.retrieve("key") == "value"
+    reopened.close()
+
+
+async def tiered_close_closes_back_cache_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.sqlite3")
+    cache = TieredCache(MemoryCache(), SQLiteCache(filename=filename, persistent=False), flush_interval=60)
+    await cache.store("key", "value")
+    await cache.aclose()
+
+    assert not os.path.exists(filename)
+
+
+async def tiered_close_can_drop_pending_writes_test() -> None:
+    back = MemoryCache()
+    cache = TieredCache(MemoryCache(), back, flush_interval=60, flush_on_close=False)
+    await cache.store("key", "value")
+    await cache.aclose()
+
+    assert len(back) == 0
+
+
+class FailingCache(MemoryCache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail = True
+
+    async def store(self, key: str, value: str, ttl=None) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        await super().store(key, value, ttl)
+
+
+async def tiered_keeps_entries_pending_after_failed_flush_test() -> None:
+    back = FailingCache()
+    cache = TieredCache(MemoryCache(), back, flush_interval=60)
+    await cache.store("key", "value")
+
+    with pytest.raises(OSError):
+        await cache.flush()
+    back.fail = False
+    await cache.flush()
+
+    assert await back.retrieve("key") == "value"
+    await cache.aclose()
+
+
+async def sqlite_store_and_retrieve_test(tmp_path: Path) -> None:
+    cache = SQLiteCache(filename=str(tmp_path / "translation.sqlite3"))
+    await cache.store("key1", "value1")
+    await cache.store("key1", "value2")
+
+    assert await cache.retrieve("key1") == "value2"
+    assert await cache.retrieve("nonexistent_key") is None
+    await cache.aclose()
+
+
+async def sqlite_groups_concurrent_stores_into_one_commit_test(tmp_path: Path) -> None:
+    cache = SQLiteCache(filename=str(tmp_path / "translation.sqlite3"))
+    await asyncio.gather(*(cache.store(f"key{i}", f"value{i}") for i in range(50)))
+
+    assert cache.commits == 1
+    assert await cache.retrieve("key49") == "value49"
+    await cache.aclose()
+
+
+async def sqlite_serves_every_batch_in_flight_test(tmp_path: Path) -> None:
+    cache = SQLiteCache(filename=str(tmp_path / "translation.sqlite3"))
+    release = threading.Event()
+    write = cache._write
+    cache._write = lambda items: (release.wait(), write(items))  # type: ignore
+    first = asyncio.ensure_future(cache.store("key1", "value1"))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(cache.store("key2", "value2"))
+    await asyncio.sleep(0.01)
+
+    try:
+        assert await cache.retrieve("key1") == "value1"
+        assert await cache.retrieve("key2") == "value2"
+    finally:
+        release.set()
+    await asyncio.gather(first, second)
+    assert cache.commits == 2
+    await cache.aclose()
+
+
+async def sqlite_shares_data_between_instances_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.sqlite3")
+    writer = SQLiteCache(filename=filename)
+    reader = SQLiteCache(filename=filename)
+    await writer.store("key", "value")
+
+    assert await reader.retrieve("key") == "value"
+    await writer.aclose()
+    await reader.aclose()
+
+
+async def sqlite_keeps_data_after_close_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.sqlite3")
+    cache = SQLiteCache(filename=filename)
+    await cache.store("key", "value")
+    await cache.aclose()
+
+    reopened = SQLiteCache(filename=filename)
+    assert await reopened.retrieve("key") == "value"
+    await reopened.aclose()
+
+
+async def sqlite_removes_database_when_not_persistent_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translation.sqlite3")
+    cache = SQLiteCache(filename=filename, persistent=False)
+    await cache.store("key", "value")
+    await cache.aclose()
+
+    assert not os.path.exists(filename)
+
+
+def make_cache_key_is_versioned_and_stable_test() -> None:
+    key = make_cache_key("Hello World", "en", "es", "service")
+
+    assert key.startswith("v1:")
+    assert key == make_cache_key(" Hello World\n", "en", "es", "service")
+    assert key == make_cache_key("Hello World", "en", "es", "service")
+
+
+def make_cache_key_distinguishes_every_part_test() -> None:
+    keys = {
+        make_cache_key("Hello World", "en", "es", "service"),
+        make_cache_key("Hello world", "en", "es", "service"),
+        make_cache_key("Hello World", "auto", "es", "service"),
+        make_cache_key("Hello World", "en", "fr", "service"),
+        make_cache_key("Hello World", "en", "es", "other"),
+    }
+
+    assert len(keys) == 5
+
+
+def make_cache_key_normalizes_unicode_test() -> None:
+    assert make_cache_key("cafe\u0301", "fr", "en") == make_cache_key("caf\u00e9", "fr", "en")
+
+
+async def bundle_serves_written_translations_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translations.bundle")
+    items = [(f"key{i}", f"välue{i}") for i in range(100)]
+
+    assert write_bundle(filename, reversed(items)) == 100
+    cache = BundleCache(filename)
+
+    assert len(cache) == 100
+    for key, value in items:
+        assert await cache.retrieve(key) == value
+    assert await cache.retrieve("key") is None
+    assert await cache.retrieve("key999") is None
+    assert sorted(await cache.items()) == sorted(items)
+    cache.close()
+
+
+async def bundle_handles_empty_bundle_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translations.bundle")
+    write_bundle(filename, [])
+    cache = BundleCache(filename)
+
+    assert await cache.retrieve("key") is None
+    cache.close()
+
+
+async def bundle_stores_in_overlay_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translations.bundle")
+    write_bundle(filename, [("key1", "value1")])
+    overlay = MemoryCache()
+    cache = BundleCache(filename, overlay=overlay)
+    await cache.store("key2", "value2")
+    await cache.store("key1", "newer")
+
+    assert await cache.retrieve("key2") == "value2"
+    assert await cache.retrieve("key1") == "newer"
+    assert await overlay.retrieve("key2") == "value2"
+    cache.close()
+
+
+def bundle_default_overlay_is_bounded_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translations.bundle")
+    write_bundle(filename, [])
+    cache = BundleCache(filename)
+
+    assert isinstance(cache.overlay, MemoryCache)
+    assert cache.overlay.max_entries is not None
+    cache.close()
+
+
+def bundle_rejects_other_files_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "translations.bundle")
+    with open(filename, "wb") as file:
+        file.write(b"not a bundle at all")
+
+    with pytest.raises(ValueError):
+        BundleCache(filename)
+
+
+async def cache_items_lists_entries_test(tmp_path: Path) -> None:
+    caches = [
+        MemoryCache(),
+        AppendOnlyCache(filename=str(tmp_path / "translation.log")),
+        SQLiteCache(filename=str(tmp_path / "translation.sqlite3")),
+        TieredCache(MemoryCache(), MemoryCache(), flush_interval=60),
+    ]
+    for cache in caches:
+        await cache.store("key1", "value1")
+        await cache.store("key2", "value2")
+        await cache.store("key1", "value3")
+
+        assert sorted(await cache.items()) == [("key1", "value3"), ("key2", "value2")]
+        close = getattr(cache, "aclose", None)
+        if close is not None:
+            await close()
+
+
+async def memory_retrieve_stale_keeps_expired_entries_for_stale_ttl_test(fake_clock) -> None:
+    cache = MemoryCache(ttl=10, stale_ttl=20, clock=fake_clock)
+    tiered = TieredCache(cache, MemoryCache())
+    await cache.store("key", "value")
+    fake_clock.now = 15
+
+    assert await cache.retrieve("key") is None
+    assert await tiered.retrieve_stale("key") == "value"
+    fake_clock.now = 40
+    assert await cache.retrieve_stale("key") is None
@@ -0,0 +1,154 @@
+import asyncio
+import functools
+import json
+import os
+from pathlib import Path
+import pytest
+from translategram.translategram.cache import BundleCache, MemoryCache, SQLiteCache, make_cache_key
+from translategram.translategram.catalog import load_catalog, main, translate_catalog
+
+PO_CATALOG = r'''msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+
+#: bot.py:10
+msgid "Hello"
+msgstr ""
+
+msgid ""
+"Two "
+"lines with \"quotes\"\n"
+msgid_plural "Hellos"
+msgstr[0] ""
+'''
+
+
+class PrefixTranslatorService:
+    def __init__(self, fail_on: str = "") -> None:
+        self.fail_on = fail_on
+        self.calls = 0
+
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls += 1
+        if text == self.fail_on:
+            raise RuntimeError("upstream error")
+        return f"{target_language}:{text}"
+
+
+def load_catalog_reads_json_list_and_object_test(tmp_path: Path) -> None:
+    (tmp_path / "list.json").write_text(json.dumps(["Hello", "World", "Hello", " "]))
+    (tmp_path / "object.json").write_text(json.dumps({"greeting": "Hello", "farewell": "Bye"}))
+
+    assert load_catalog(str(tmp_path / "list.json")) == ["Hello", "World"]
+    assert load_catalog(str(tmp_path / "object.json")) == ["Hello", "Bye"]
+
+
+def load_catalog_reads_csv_column_test(tmp_path: Path) -> None:
+    (tmp_path / "header.csv").write_text('id,source\n1,Hello\n2,"Hello, World"\n')
+    (tmp_path / "plain.csv").write_text("Hello,ignored\nBye\n")
+
+    assert load_catalog(str(tmp_path / "header.csv")) == ["Hello", "Hello, World"]
+    assert load_catalog(str(tmp_path / "plain.csv")) == ["Hello", "Bye"]
+
+
+def load_catalog_reads_po_msgids_test(tmp_path: Path) -> None:
+    (tmp_path / "messages.po").write_text(PO_CATALOG)
+
+    assert load_catalog(str(tmp_path / "messages.po")) == ["Hello", 'Two lines with "quotes"\n', "Hellos"]
+
+
+def load_catalog_rejects_unknown_formats_test(tmp_path: Path) -> None:
+    (tmp_path / "bad.json").write_text(json.dumps({"nested": {"a": "b"}}))
+
+    with pytest.raises(ValueError):
+        load_catalog(str(tmp_path / "messages.yaml"))
+    with pytest.raises(ValueError):
+        load_catalog(str(tmp_path / "bad.json"))
+
+
+async def translate_catalog_fills_cache_and_resumes_test() -> None:
+    cache = MemoryCache(max_entries=None)
+    texts = ["Hello", "World", "Bye"]
+    progress = []
+
+    report = await translate_catalog(
+        texts, ["es", "fr", "en-US"], PrefixTranslatorService, cache, "en", chunk_size=2,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert (report.translated, report.cached, report.failed) == (6, 0, 0)
+    assert progress[-1] == (6, 6)
+    key = make_cache_key("World", "en", "fr", "PrefixTranslatorService")
+    assert await cache.retrieve(key) == "fr:World"
+    report = await translate_catalog(texts, ["es", "fr", "de"], PrefixTranslatorService, cache, "en")
+    assert (report.translated, report.cached, report.failed) == (3, 6, 0)
+
+
+async def translate_catalog_leaves_failures_for_next_run_test() -> None:
+    cache = MemoryCache(max_entries=None)
+    failing = functools.partial(PrefixTranslatorService, fail_on="World")
+
+    report = await translate_catalog(["Hello", "World"], ["es"], failing, cache, "en")
+
+    assert (report.translated, report.failed) == (1, 1)
+    assert await cache.retrieve(make_cache_key("World", "en", "es", "PrefixTranslatorService")) is None
+    report = await translate_catalog(["Hello", "World"], ["es"], PrefixTranslatorService, cache, "en")
+    assert (report.translated, report.cached) == (1, 1)
+
+
+async def translate_catalog_shards_across_processes_test(tmp_path: Path) -> None:
+    cache = SQLiteCache(filename=str(tmp_path / "catalog.sqlite3"))
+    texts = [f"Message {i}" for i in range(20)]
+
+    report = await translate_catalog(
+        texts, ["es", "fr"], PrefixTranslatorService, cache, "en", chunk_size=3, processes=2
+    )
+
+    assert (report.translated, report.failed) == (40, 0)
+    assert await cache.retrieve(make_cache_key("Message 7", "en", "fr", "PrefixTranslatorService")) == "fr:Message 7"
+    await cache.aclose()
+
+
+class RecordingPrefixTranslatorService(PrefixTranslatorService):
+    def __init__(self, log: str) -> None:
+        super().__init__()
+        with open(log, "a") as file:
+            file.write(f"{os.getpid()}\n")
+
+
+async def translate_catalog_creates_one_service_per_process_test(tmp_path: Path) -> None:
+    log = str(tmp_path / "services.log")
+    factory = functools.partial(RecordingPrefixTranslatorService, log)
+    texts = [f"Message {i}" for i in range(20)]
+
+    report = await translate_catalog(texts, ["es", "fr"], factory, MemoryCache(), "en", chunk_size=3, processes=2)
+
+    pids = Path(log).read_text().split()
+    assert (report.translated, report.failed) == (40, 0)
+    assert len(pids) == len(set(pids)) <= 2
+    assert str(os.getpid()) not in pids
+
+
+def catalog_cli_writes_cache_and_bundle_test(tmp_path: Path, fake_translation_server, capsys) -> None:
+    (tmp_path / "messages.json").write_text(json.dumps(["Hello", "Bye"]))
+    args = [
+        str(tmp_path / "messages.json"), "-l", "es", "fr", "--source-lang", "en", "--service", "http",
+        "--base-url", fake_translation_server.base_url, "--cache", str(tmp_path / "catalog.sqlite3"),
+    ]
+
+    assert main([*args, "--bundle", str(tmp_path / "catalog.bundle")]) == 0
+    assert "4 translated, 0 already cached, 0 failed" in capsys.readouterr().err
+    bundle = BundleCache(str(tmp_path / "catalog.bundle"))
+    assert asyncio.run(bundle.retrieve(make_cache_key("Bye", "en", "fr", "HttpTranslatorService"))) == "BYE"
+    bundle.close()
+    assert main(args) == 0
+    assert "0 translated, 4 already cached" in capsys.readouterr().err
+
+
+def catalog_cli_requires_cache_or_bundle_test(tmp_path: Path, capsys) -> None:
+    (tmp_path / "messages.json").write_text(json.dumps(["Hello"]))
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path / "messages.json"), "-l", "es"])
+    assert exit_info.value.code == 2
+    assert "--cache" in capsys.readouterr().err
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from translategram.translategram.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+
+
+async def succeed() -> str:
+    return "ok"
+
+
+async def fail() -> str:
+    raise OSError("down")
+
+
+async def circuit_breaker_opens_after_consecutive_failures_test() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(OSError):
+            await breaker.call(fail)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitBreakerOpen):
+        await breaker.call(succeed)
+    assert breaker.rejected == 1
+
+
+async def circuit_breaker_success_resets_failures_test() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+    assert await breaker.call(succeed) == "ok"
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+
+    assert breaker.state == "closed"
+
+
+async def circuit_breaker_counts_slow_calls_test(fake_clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=1.0, clock=fake_clock)
+
+    async def slow() -> str:
+        fake_clock.now += 2
+        return "late"
+
+    assert await breaker.call(slow) == "late"
+    assert breaker.state == "open"
+
+
+async def circuit_breaker_times_out_hanging_calls_test() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, call_timeout=0.01)
+
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await breaker.call(hang)
+    assert breaker.state == "open"
+
+
+async def circuit_breaker_half_open_trial_closes_or_reopens_test(fake_clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=fake_clock)
+    changes = []
+    breaker.add_listener(lambda old, new: changes.append((old, new)))
+
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+    fake_clock.now = 10
+    assert breaker.state == "half_open"
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+    assert breaker.state == "open"
+    fake_clock.now = 20
+    assert await breaker.call(succeed) == "ok"
+
+    assert breaker.state == "closed"
+    assert changes == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+
+
+async def circuit_breaker_limits_half_open_trial_calls_test(fake_clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=fake_clock)
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+    fake_clock.now = 10
+    release = asyncio.Event()
+
+    async def trial() -> str:
+        await release.wait()
+        return "ok"
+
+    first = asyncio.ensure_future(breaker.call(trial))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitBreakerOpen):
+        await breaker.call(succeed)
+    release.set()
+
+    assert await first == "ok"
+    assert breaker.state == "closed"
+
+
+async def circuit_breaker_opens_once_on_concurrent_failures_test(fake_clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, clock=fake_clock)
+    changes = []
+    breaker.add_listener(lambda old, new: changes.append((old, new)))
+    release = asyncio.Event()
+
+    async def fail_later() -> str:
+        await release.wait()
+        fake_clock.now += 1
+        raise OSError("down")
+
+    calls = [asyncio.ensure_future(breaker.call(fail_later)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*calls, return_exceptions=True)
+
+    assert changes == [("closed", "open")]
+    assert breaker._opened_at == 2
+
+
+async def circuit_breaker_ignores_calls_started_before_half_open_test(fake_clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=fake_clock)
+    early_release, trial_release = asyncio.Event(), asyncio.Event()
+
+    async def succeed_after(release: asyncio.Event) -> str:
+        await release.wait()
+        return "ok"
+
+    early = asyncio.ensure_future(breaker.call(lambda: succeed_after(early_release)))
+    await asyncio.sleep(0)
+    with pytest.raises(OSError):
+        await breaker.call(fail)
+    fake_clock.now = 10
+    trial = asyncio.ensure_future(breaker.call(lambda: succeed_after(trial_release)))
+    await asyncio.sleep(0)
+    early_release.set()
+
+    assert await early == "ok"
+    assert breaker.state == "half_open"
+    trial_release.set()
+    assert await trial == "ok"
+    assert breaker.state == "closed"
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+IMPORT_BUDGET = 0.25
+WORKER_IMPORTS = (
+    "import translategram, translategram.translategram.cache, translategram.translategram.translator_services, "
+    "translategram.translategram.languages"
+)
+
+
+def _import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run `code` in a fresh interpreter with `-X importtime` and return the nesting level and cumulative microseconds
+    of every module it imported.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, module = line[len("import time:"):].split("|")
+            times[module.strip()] = ((len(module) - len(module.lstrip()) - 1) // 2, int(cumulative))
+    return times
+
+
+def worker_imports_skip_telegram_and_services_libraries_test() -> None:
+    times = _import_times(WORKER_IMPORTS)
+
+    assert not {"telegram", "httpx", "mtranslate"} & times.keys()
+
+
+def worker_imports_fit_budget_test() -> None:
+    times = _import_times(WORKER_IMPORTS)
+
+    total = sum(time for module, (level, time) in times.items() if level == 0 and module.startswith("translategram"))
+    assert total / 1e6 < IMPORT_BUDGET
+
+
+def public_names_load_on_first_access_test() -> None:
+    times = _import_times("import translategram; translategram.PythonTelegramBotTranslator; translategram.MemoryCache")
+
+    assert "telegram" in times
+    assert "translategram.translategram.cache" in times
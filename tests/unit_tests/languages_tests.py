@@ -0,0 +1,102 @@
+from pathlib import Path
+import pytest
+from translategram.translategram.cache import AppendOnlyCache, MemoryCache
+from translategram.translategram.languages import (
+    LanguageResolver,
+    detect_language,
+    normalize_language,
+    same_language,
+)
+
+
+def normalize_language_test() -> None:
+    assert normalize_language(" pt_BR ") == "pt-br"
+
+
+@pytest.mark.parametrize(
+    "language_code, expected",
+    [
+        ("en", "en"),
+        ("en-US", "en"),
+        ("pt-br", "pt"),
+        ("zh-hans", "zh-CN"),
+        ("zh-TW", "zh-TW"),
+        ("he", "iw"),
+        (None, "en"),
+        ("", "en"),
+    ],
+)
+def resolve_code_normalizes_and_maps_aliases_test(language_code, expected) -> None:
+    assert LanguageResolver().resolve_code(language_code) == expected
+
+
+def resolve_code_respects_supported_languages_test() -> None:
+    resolver = LanguageResolver(supported=["en", "es", "pt-BR"], default="es")
+
+    assert resolver.resolve_code("pt-br") == "pt-br"
+    assert resolver.resolve_code("es-MX") == "es"
+    assert resolver.resolve_code("fr") == "es"
+
+
+async def resolve_uses_override_over_client_language_test() -> None:
+    resolver = LanguageResolver()
+
+    assert await resolver.set_override(42, "es-ES") == "es"
+    assert await resolver.resolve(42, "de") == "es"
+    assert await resolver.resolve(7, "de") == "de"
+    await resolver.clear_override(42)
+    assert await resolver.resolve(42, "de") == "de"
+
+
+async def resolve_persists_overrides_test(tmp_path: Path) -> None:
+    filename = str(tmp_path / "languages.log")
+    store = AppendOnlyCache(filename=filename)
+    await LanguageResolver(overrides=store).set_override(42, "fr")
+    store.close()
+
+    store = AppendOnlyCache(filename=filename)
+    assert await LanguageResolver(overrides=store).resolve(42, "de") == "fr"
+    store.close()
+
+
+async def resolve_keeps_bounded_user_map_test() -> None:
+    overrides = MemoryCache()
+    resolver = LanguageResolver(overrides=overrides, max_users=2)
+    for user_id in range(5):
+        await resolver.set_override(user_id, "fr")
+
+    assert len(resolver._users) == 2
+    assert await resolver.resolve(0, "de") == "fr"
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        ("en", "en-US", True),
+        ("EN_gb", "en", True),
+        ("he", "iw", True),
+        ("zh", "zh-CN", True),
+        ("zh-CN", "zh-TW", False),
+        ("en", "fr", False),
+        ("auto", "auto", False),
+    ],
+)
+def same_language_test(first, second, expected) -> None:
+    assert same_language(first, second) is expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("This is the bot you can trust with your messages", "en"),
+        ("Hola, este es el bot para los mensajes de la casa", "es"),
+        ("Привет, это бот для всех, как вы и хотели", "ru"),
+        ("Привіт, це бот для всіх", "uk"),
+        ("안녕하세요", "ko"),
+        ("こんにちは世界", "ja"),
+        ("Hello World", None),
+        ("12345 !!!", None),
+    ],
+)
+def detect_language_test(text, expected) -> None:
+    assert detect_language(text) == expected
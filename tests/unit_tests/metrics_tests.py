@@ -0,0 +1,52 @@
+import pytest
+from translategram.translategram.metrics import NoOpMetrics, PrometheusMetrics
+
+
+def noop_metrics_records_nothing_test() -> None:
+    metrics = NoOpMetrics()
+
+    with metrics.stage("translate"):
+        metrics.increment("cache_hits", "fr")
+
+
+def prometheus_metrics_times_stages_test(fake_clock) -> None:
+    metrics = PrometheusMetrics(buckets=(0.1, 1.0), clock=fake_clock)
+
+    with metrics.stage("translate"):
+        assert metrics.in_flight("translate") == 1
+        fake_clock.now += 0.5
+    with pytest.raises(RuntimeError):
+        with metrics.stage("translate"):
+            fake_clock.now += 2.0
+            raise RuntimeError
+
+    assert metrics.in_flight("translate") == 0
+    assert metrics.error_rate("translate") == 0.5
+    assert metrics.error_rate("handler") is None
+    assert metrics.render().splitlines()[2:8] == [
+        'translategram_stage_seconds_bucket{stage="translate",le="0.1"} 0',
+        'translategram_stage_seconds_bucket{stage="translate",le="1.0"} 1',
+        'translategram_stage_seconds_bucket{stage="translate",le="+Inf"} 2',
+        'translategram_stage_seconds_sum{stage="translate"} 2.5',
+        'translategram_stage_seconds_count{stage="translate"} 2',
+        "# HELP translategram_stage_errors_total Failed runs of each stage.",
+    ]
+
+
+def prometheus_metrics_counts_events_per_language_test() -> None:
+    metrics = PrometheusMetrics(namespace="bot")
+    for _ in range(3):
+        metrics.increment("cache_hits", "fr")
+    metrics.increment("cache_misses", "fr")
+    metrics.increment("cache_misses", 'x"y')
+
+    assert metrics.hit_ratio("fr") == 0.75
+    assert metrics.hit_ratio("de") is None
+    rendered = metrics.render()
+    assert 'bot_cache_hits_total{language="fr"} 3\n' in rendered
+    assert 'bot_cache_misses_total{language="x\\"y"} 1\n' in rendered
+
+
+def prometheus_metrics_rejects_unsorted_buckets_test() -> None:
+    with pytest.raises(ValueError):
+        PrometheusMetrics(buckets=(1.0, 0.1))
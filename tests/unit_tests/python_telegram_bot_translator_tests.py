@@ -1,3 +1,22 @@
+import asyncio
+from datetime import datetime
+import json
+import pytest
+from telegram import Chat, Message, Update, User
+from translategram.python_telegram_bot_translator.adapter import PythonTelegramBotAdapter
+from translategram.translategram.cache import (
+    AppendOnlyCache,
+    BundleCache,
+    MemoryCache,
+    TieredCache,
+    make_cache_key,
+)
+from translategram.translategram.circuit_breaker import CircuitBreaker
+from translategram.translategram.languages import LanguageResolver
+from translategram.translategram.metrics import PrometheusMetrics
+from translategram.translategram.translator_services import TranslatorServiceError
+
+
 def init_test(adapter_with_mock, mock_translator_service):
     assert adapter_with_mock._translator_service == mock_translator_service()
 
@@ -84,3 +103,661 @@ async def dynamic_handler_translator_with_sync_handler_async_function_test(
     @adapter.dynamic_handler_translator(async_translate_function, "en")
     def test_func(update, context, message) -> None:
         assert message == "Greater than 10"
+
+
+class CountingTranslatorService:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"{target_language}:{text}"
+
+
+async def handler_translator_coalesces_concurrent_translations_test(
+    update, context, cache
+):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    results = await asyncio.gather(*(func_test(update, context) for _ in range(20)))
+
+    assert results == ["en:Hello World"] * 20
+    assert adapter._translator_service.calls == 1
+    assert adapter.single_flight.deduplicated == 19
+    key = make_cache_key("Hello World", "auto", "en", "CountingTranslatorService")
+    assert await cache.retrieve(key) == "en:Hello World"
+
+
+async def handler_translator_shares_cache_entries_between_handlers_test(
+    update, context, cache
+):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def first(update, context, message):
+        return message
+
+    @adapter.handler_translator("Hello World")
+    async def second(update, context, message):
+        return message
+
+    assert await first(update, context) == "en:Hello World"
+    assert await second(update, context) == "en:Hello World"
+    assert adapter._translator_service.calls == 1
+
+
+async def dynamic_handler_translator_keys_cache_on_message_test(
+    update, context, cache
+):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.dynamic_handler_translator(lambda user_input: f"You said {user_input}")
+    async def echo(update, context, message):
+        return message
+
+    context.args = ["one"]
+    assert await echo(update, context) == "en:You said one"
+    context.args = ["two"]
+    assert await echo(update, context) == "en:You said two"
+
+
+async def warm_up_fills_cache_for_registered_messages_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def first(update, context, message):
+        return message
+
+    @adapter.handler_translator("Goodbye", source_lang="en")
+    async def second(update, context, message):
+        return message
+
+    progress = []
+    report = await adapter.warm_up(
+        ["en", "es"], max_concurrency=2, progress=lambda *args: progress.append(args)
+    )
+
+    assert adapter.messages == (("Hello World", "auto"), ("Goodbye", "en"))
+    assert (report.translated, report.cached, report.failed) == (3, 0, 0)
+    assert progress[-1] == (3, 3)
+    assert await first(update, context) == "en:Hello World"
+    assert adapter._translator_service.calls == 3
+
+    report = await adapter.warm_up(["en", "es"])
+    assert (report.translated, report.cached, report.failed) == (0, 3, 0)
+
+
+async def warm_up_resolves_languages_like_users_test(context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache, language_resolver=LanguageResolver())
+    user = User(id=42, first_name="Test", is_bot=False, language_code="pt-br")
+    update = Update(1, message=Message(1, datetime.now(), Chat(42, Chat.PRIVATE), from_user=user))
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    report = await adapter.warm_up(["pt-br", "pt", "en-US"])
+
+    assert (report.translated, report.cached, report.failed) == (2, 0, 0)
+    assert await func_test(update, context) == "pt:Hello World"
+    assert adapter._translator_service.calls == 2
+
+
+async def warm_up_counts_failed_translations_test(cache):
+    class FailingTranslatorService(CountingTranslatorService):
+        async def translate_str(self, text, target_language, source_language="auto"):
+            if target_language == "xx":
+                raise ValueError(target_language)
+            return await super().translate_str(text, target_language, source_language)
+
+    adapter = PythonTelegramBotAdapter(FailingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    report = await adapter.warm_up(["es", "xx"])
+
+    assert (report.translated, report.cached, report.failed) == (1, 0, 1)
+
+
+async def warm_up_counts_rejected_translations_apart_test(cache):
+    adapter = PythonTelegramBotAdapter(RejectingTranslatorService, cache, unsupported_language_threshold=2)
+    _handlers(adapter)
+
+    report = await adapter.warm_up(["es"], max_concurrency=1)
+
+    assert (report.translated, report.failed, report.rejected, report.fallbacks) == (0, 0, 3, 0)
+    assert adapter._translator_service.calls == 2
+    assert await cache.items() == []
+
+    report = await adapter.warm_up(["es"])
+    assert (report.translated, report.cached, report.rejected) == (0, 0, 3)
+    assert adapter._translator_service.calls == 2
+
+
+async def warm_up_counts_circuit_breaker_fallbacks_apart_test(cache):
+    adapter = PythonTelegramBotAdapter(
+        DownTranslatorService, cache, circuit_breaker=CircuitBreaker(failure_threshold=1)
+    )
+    _handlers(adapter)
+
+    report = await adapter.warm_up(["es"], max_concurrency=1)
+
+    assert (report.translated, report.failed, report.rejected, report.fallbacks) == (0, 1, 0, 2)
+    assert adapter._translator_service.calls == 1
+    assert await cache.items() == []
+
+
+async def warm_up_requires_cache_system_test():
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService)
+
+    with pytest.raises(RuntimeError):
+        await adapter.warm_up(["es"])
+
+
+async def export_bundle_serves_translations_without_service_calls_test(
+    update, context, tmp_path
+):
+    source = PythonTelegramBotAdapter(CountingTranslatorService, MemoryCache())
+
+    @source.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    await source.warm_up(["en", "es"])
+    filename = str(tmp_path / "translations.bundle")
+    assert await source.export_bundle(filename) == 2
+
+    bundle = BundleCache(filename)
+    node = PythonTelegramBotAdapter(CountingTranslatorService, bundle)
+
+    @node.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "en:Hello World"
+    assert node._translator_service.calls == 0
+    bundle.close()
+
+
+async def aclose_closes_close_only_cache_test(update, context, tmp_path):
+    cache = AppendOnlyCache(filename=str(tmp_path / "translation.log"))
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "en:Hello World"
+    await adapter.aclose()
+
+    assert cache._file.closed
+
+
+async def export_bundle_requires_listable_cache_test(tmp_path):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService)
+
+    with pytest.raises(RuntimeError):
+        await adapter.export_bundle(str(tmp_path / "translations.bundle"))
+
+
+class DownTranslatorService(CountingTranslatorService):
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls += 1
+        raise OSError("upstream down")
+
+
+async def circuit_breaker_falls_back_to_source_message_test(update, context, cache):
+    breaker = CircuitBreaker(failure_threshold=1)
+    adapter = PythonTelegramBotAdapter(DownTranslatorService, cache, circuit_breaker=breaker)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "Hello World"
+    assert await func_test(update, context) == "Hello World"
+    assert adapter._translator_service.calls == 1
+    assert breaker.state == "open"
+
+
+async def circuit_breaker_falls_back_to_stale_translation_test(update, context, fake_clock):
+    cache = MemoryCache(ttl=10, stale_ttl=100, clock=fake_clock)
+    key = make_cache_key("Hello World", "auto", "en", "DownTranslatorService")
+    await cache.store(key, "en:Hello World")
+    fake_clock.now = 20
+    adapter = PythonTelegramBotAdapter(
+        DownTranslatorService, cache, circuit_breaker=CircuitBreaker()
+    )
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "en:Hello World"
+    assert cache.stale_hits == 1
+
+
+async def translation_errors_propagate_without_circuit_breaker_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(DownTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    with pytest.raises(OSError):
+        await func_test(update, context)
+
+
+async def stale_while_revalidate_serves_stale_and_refreshes_test(update, context, fake_clock):
+    cache = MemoryCache(ttl=10, stale_ttl=100, clock=fake_clock)
+    key = make_cache_key("Hello World", "auto", "en", "CountingTranslatorService")
+    await cache.store(key, "old translation")
+    fake_clock.now = 20
+    adapter = PythonTelegramBotAdapter(
+        CountingTranslatorService, cache, stale_while_revalidate=True
+    )
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    results = await asyncio.gather(*(func_test(update, context) for _ in range(5)))
+
+    assert results == ["old translation"] * 5
+    assert await cache.retrieve(key) is None
+    await asyncio.sleep(0.05)
+    assert adapter._translator_service.calls == 1
+    assert await cache.retrieve(key) == "en:Hello World"
+    assert await func_test(update, context) == "en:Hello World"
+
+
+async def stale_while_revalidate_refreshes_tiered_cache_test(update, context, fake_clock):
+    cache = TieredCache(MemoryCache(ttl=10, stale_ttl=100, clock=fake_clock), MemoryCache(), flush_interval=60)
+    key = make_cache_key("Hello World", "auto", "en", "CountingTranslatorService")
+    await cache.store(key, "old translation")
+    await cache.flush()
+    fake_clock.now = 20
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache, stale_while_revalidate=True)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "old translation"
+    await asyncio.sleep(0.05)
+    assert adapter._translator_service.calls == 1
+    assert await func_test(update, context) == "en:Hello World"
+    await cache.flush()
+    assert await cache.back.retrieve(key) == "en:Hello World"
+    await adapter.aclose()
+
+
+async def stale_while_revalidate_bounds_refresh_concurrency_test(update, context, fake_clock):
+    cache = MemoryCache(ttl=10, stale_ttl=100, clock=fake_clock)
+    messages = [f"Message {i}" for i in range(6)]
+    for message in messages:
+        await cache.store(
+            make_cache_key(message, "auto", "en", "ConcurrencyTrackingService"), "old"
+        )
+    fake_clock.now = 20
+
+    class ConcurrencyTrackingService(CountingTranslatorService):
+        running = 0
+        max_running = 0
+
+        async def translate_str(self, text, target_language, source_language="auto"):
+            type(self).running += 1
+            type(self).max_running = max(type(self).max_running, type(self).running)
+            try:
+                return await super().translate_str(text, target_language, source_language)
+            finally:
+                type(self).running -= 1
+
+    adapter = PythonTelegramBotAdapter(
+        ConcurrencyTrackingService, cache, stale_while_revalidate=True, max_refreshes=2
+    )
+    handlers = []
+    for message in messages:
+        @adapter.handler_translator(message)
+        async def func_test(update, context, message):
+            return message
+
+        handlers.append(func_test)
+
+    assert await asyncio.gather(*(handler(update, context) for handler in handlers)) == ["old"] * 6
+    await asyncio.sleep(0.1)
+    assert adapter._translator_service.calls == 6
+    assert ConcurrencyTrackingService.max_running == 2
+
+
+async def stale_while_revalidate_counts_failed_refreshes_test(update, context, fake_clock):
+    cache = MemoryCache(ttl=10, stale_ttl=100, clock=fake_clock)
+    await cache.store(make_cache_key("Hello World", "auto", "en", "DownTranslatorService"), "old")
+    fake_clock.now = 20
+    adapter = PythonTelegramBotAdapter(DownTranslatorService, cache, stale_while_revalidate=True)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "old"
+    await asyncio.sleep(0.01)
+    assert adapter.refresh_failures == 1
+
+
+async def dynamic_handler_translator_streams_chunks_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+    context.args = ["First sentence.", "Second sentence."]
+
+    @adapter.dynamic_handler_translator(lambda user_input: user_input, stream=True, max_chunk_chars=20)
+    async def func_test(update, context, message):
+        return [chunk async for chunk in message]
+
+    assert await func_test(update, context) == ["en:First sentence. ", "en:Second sentence."]
+    assert adapter._translator_service.calls == 2
+
+
+async def language_resolver_picks_translation_language_test(context, cache):
+    resolver = LanguageResolver()
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache, language_resolver=resolver)
+    user = User(id=42, first_name="Test", is_bot=False, language_code="pt-br")
+    update = Update(
+        1, message=Message(1, datetime.now(), Chat(42, Chat.PRIVATE), from_user=user)
+    )
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "pt:Hello World"
+    await resolver.set_override(42, "fr")
+    assert await func_test(update, context) == "fr:Hello World"
+
+
+@pytest.mark.parametrize(
+    "message, source_lang",
+    [("Hello World", "en"), ("Hello World", "en-US"), ("This is the bot you can trust", "auto")],
+)
+async def handler_translator_skips_messages_in_user_language_test(update, context, cache, message, source_lang):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator(message, source_lang=source_lang)
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == message
+    assert adapter._translator_service.calls == 0
+    assert adapter.skipped_translations == 1
+    assert await cache.items() == []
+
+
+async def dynamic_handler_translator_translates_template_once_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.dynamic_handler_translator(
+        lambda user_input: {"name": user_input}, source_lang="fr", template="Bonjour {name}, {{ok}}"
+    )
+    async def greet(update, context, message):
+        return message
+
+    for name in ["Ann", "Bob", "{0}"]:
+        context.args = [name]
+        assert await greet(update, context) == f"en:Bonjour {name}, {{ok}}"
+    assert adapter._translator_service.calls == 1
+    assert adapter.messages == (("Bonjour {0}, {{ok}}", "fr"),)
+    key = make_cache_key("Bonjour {0}, {{ok}}", "fr", "en", "CountingTranslatorService")
+    assert await cache.retrieve(key) == "en:Bonjour {0}, {{ok}}"
+
+
+class TokenDroppingTranslatorService(CountingTranslatorService):
+    async def translate_str(self, text, target_language, source_language="auto"):
+        return (await super().translate_str(text, target_language, source_language)).replace("{0}", "")
+
+
+async def dynamic_handler_translator_falls_back_when_template_is_mangled_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(TokenDroppingTranslatorService, cache)
+    context.args = ["Ann"]
+
+    @adapter.dynamic_handler_translator(lambda user_input: {"name": user_input}, "fr", template="Bonjour {name}")
+    async def greet(update, context, message):
+        return message
+
+    assert await greet(update, context) == "en:Bonjour Ann"
+    assert adapter.template_fallbacks == 1
+
+
+class TokenDroppingOnceTranslatorService(CountingTranslatorService):
+    async def translate_str(self, text, target_language, source_language="auto"):
+        translated = await super().translate_str(text, target_language, source_language)
+        return translated.replace("{0}", "") if self.calls == 1 else translated
+
+
+@pytest.mark.parametrize("negative_ttl, calls, fallbacks", [(0, 3, 1), (300, 2, 2)])
+async def dynamic_handler_translator_retries_mangled_template_test(
+    update, context, cache, negative_ttl, calls, fallbacks
+):
+    adapter = PythonTelegramBotAdapter(TokenDroppingOnceTranslatorService, cache, negative_ttl=negative_ttl)
+    context.args = ["Ann"]
+
+    @adapter.dynamic_handler_translator(lambda user_input: {"name": user_input}, "fr", template="Bonjour {name}")
+    async def greet(update, context, message):
+        return message
+
+    assert await greet(update, context) == "en:Bonjour Ann"
+    assert await greet(update, context) == "en:Bonjour Ann"
+    assert adapter.template_fallbacks == fallbacks
+    assert adapter._translator_service.calls == calls
+
+
+def dynamic_handler_translator_rejects_invalid_templates_test() -> None:
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService)
+
+    with pytest.raises(ValueError):
+        adapter.dynamic_handler_translator(lambda user_input: {}, template="Hello {}")
+    with pytest.raises(ValueError):
+        adapter.dynamic_handler_translator(lambda user_input: {}, template="Hello {name}", stream=True)
+
+
+async def metrics_record_pipeline_stages_test(update, context, cache):
+    metrics = PrometheusMetrics()
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache, metrics=metrics)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    await func_test(update, context)
+    await func_test(update, context)
+
+    assert metrics.count("cache_misses", "en") == 1
+    assert metrics.count("cache_hits", "en") == 1
+    assert metrics.hit_ratio("en") == 0.5
+    assert metrics.error_rate("translate") == 0.0
+    rendered = metrics.render()
+    for stage, count in [
+        ("resolve_language", 2), ("cache_retrieve", 2), ("translate", 1), ("cache_store", 1), ("handler", 2)
+    ]:
+        assert f'translategram_stage_seconds_count{{stage="{stage}"}} {count}\n' in rendered
+
+
+async def metrics_record_upstream_errors_test(update, context, cache):
+    metrics = PrometheusMetrics()
+    adapter = PythonTelegramBotAdapter(
+        DownTranslatorService, cache, circuit_breaker=CircuitBreaker(), metrics=metrics
+    )
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "Hello World"
+    assert metrics.error_rate("translate") == 1.0
+    assert metrics.in_flight("translate") == 0
+
+
+async def handler_translator_translates_message_passed_at_call_time_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("Hello World")
+    def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "en:Hello World"
+    assert await func_test(update, context, "Good bye") == "en:Good bye"
+    assert await func_test(update, context) == "en:Hello World"
+    assert adapter._translator_service.calls == 2
+
+
+class RejectingTranslatorService(CountingTranslatorService):
+    def __init__(self, status_code: int = 400) -> None:
+        super().__init__()
+        self.status_code = status_code
+
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls += 1
+        raise TranslatorServiceError("rejected", status_code=self.status_code)
+
+
+async def negative_cache_memoizes_rejected_messages_test(update, context, cache):
+    metrics = PrometheusMetrics()
+    adapter = PythonTelegramBotAdapter(RejectingTranslatorService, cache, metrics=metrics, negative_ttl=0.05)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "Hello World"
+    assert await func_test(update, context) == "Hello World"
+    assert adapter._translator_service.calls == 1
+    assert metrics.count("negative_hits", "en") == 1
+    assert metrics.hit_ratio("en") == 0.0
+    assert await cache.retrieve(make_cache_key("Hello World", "auto", "en", "RejectingTranslatorService")) is None
+    await asyncio.sleep(0.06)
+    assert await func_test(update, context) == "Hello World"
+    assert adapter._translator_service.calls == 2
+
+
+async def negative_cache_skips_transient_errors_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(lambda: RejectingTranslatorService(status_code=503), cache)
+
+    @adapter.handler_translator("Hello World")
+    async def func_test(update, context, message):
+        return message
+
+    for _ in range(2):
+        with pytest.raises(TranslatorServiceError):
+            await func_test(update, context)
+    assert adapter._translator_service.calls == 2
+
+
+def _handlers(adapter, messages=("Hello World", "Good bye", "See you")):
+    handlers = []
+    for message in messages:
+
+        @adapter.handler_translator(message)
+        async def func_test(update, context, message):
+            return message
+
+        handlers.append(func_test)
+    return handlers
+
+
+async def unsupported_languages_are_remembered_across_restarts_test(update, context, cache):
+    store = MemoryCache()
+    adapter = PythonTelegramBotAdapter(
+        RejectingTranslatorService, cache, unsupported_language_threshold=2, unsupported_languages_cache=store
+    )
+    handlers = _handlers(adapter)
+
+    assert [await handler(update, context) for handler in handlers] == ["Hello World", "Good bye", "See you"]
+    assert adapter._translator_service.calls == 2
+    assert adapter.unsupported_languages == ("en",)
+    assert await cache.items() == []
+    restarted = PythonTelegramBotAdapter(RejectingTranslatorService, cache, unsupported_languages_cache=store)
+    other_service = PythonTelegramBotAdapter(CountingTranslatorService, cache, unsupported_languages_cache=store)
+
+    assert await _handlers(restarted, ["Something new"])[0](update, context) == "Something new"
+    assert restarted._translator_service.calls == 0
+    assert await _handlers(other_service, ["Something new"])[0](update, context) == "en:Something new"
+    assert other_service._translator_service.calls == 1
+
+
+async def unsupported_languages_expire_and_can_be_reset_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(
+        RejectingTranslatorService, cache, unsupported_language_threshold=1, unsupported_language_ttl=0.05
+    )
+    first, second, _ = _handlers(adapter)
+
+    await first(update, context)
+    assert adapter.unsupported_languages == ("en",)
+    await asyncio.sleep(0.06)
+    assert adapter.unsupported_languages == ()
+    await second(update, context)
+    assert adapter._translator_service.calls == 2
+    await adapter.reset_unsupported_languages(["en"])
+    assert adapter.unsupported_languages == ()
+    await second(update, context)
+    assert adapter._translator_service.calls == 3
+
+
+async def expired_unsupported_languages_are_forgotten_across_restarts_test(update, context, cache):
+    store = MemoryCache()
+    adapter = PythonTelegramBotAdapter(
+        RejectingTranslatorService,
+        cache,
+        unsupported_language_threshold=2,
+        unsupported_language_ttl=0.05,
+        unsupported_languages_cache=store,
+    )
+    first, second, third = _handlers(adapter)
+    await first(update, context)
+    await second(update, context)
+    assert adapter.unsupported_languages == ("en",)
+
+    await asyncio.sleep(0.06)
+    await third(update, context)
+
+    assert [json.loads(value) for _, value in await store.items()] == [{}]
+
+
+async def rejected_translations_do_not_open_circuit_breaker_test(update, context, cache):
+    breaker = CircuitBreaker(failure_threshold=3)
+    adapter = PythonTelegramBotAdapter(RejectingTranslatorService, cache, circuit_breaker=breaker)
+
+    messages = ["Hello World", "Good bye", "See you", "Welcome"]
+
+    assert [await handler(update, context) for handler in _handlers(adapter, messages)] == messages
+    assert breaker.state == "closed"
+    assert adapter._translator_service.calls == 3
+
+
+async def only_bad_requests_mark_languages_unsupported_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(
+        lambda: RejectingTranslatorService(status_code=403), cache, unsupported_language_threshold=1
+    )
+    first, second, _ = _handlers(adapter)
+
+    for handler in (first, second, first):
+        with pytest.raises(TranslatorServiceError):
+            await handler(update, context)
+    assert adapter._translator_service.calls == 3
+    assert adapter.unsupported_languages == ()
+
+
+async def handler_translator_skips_messages_without_letters_test(update, context, cache):
+    adapter = PythonTelegramBotAdapter(CountingTranslatorService, cache)
+
+    @adapter.handler_translator("👍 100%")
+    async def func_test(update, context, message):
+        return message
+
+    assert await func_test(update, context) == "👍 100%"
+    assert adapter._translator_service.calls == 0
+    assert adapter.skipped_translations == 1
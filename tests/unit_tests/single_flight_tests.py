@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from translategram.translategram.single_flight import SingleFlight
+
+
+async def single_flight_coalesces_concurrent_calls_test() -> None:
+    single_flight = SingleFlight()
+    started = 0
+
+    async def call() -> str:
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(single_flight.do("key", call) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert started == 1
+    assert single_flight.calls == 1
+    assert single_flight.deduplicated == 9
+    assert single_flight.in_flight == 0
+
+
+async def single_flight_runs_different_keys_separately_test() -> None:
+    single_flight = SingleFlight()
+
+    async def call(value: str) -> str:
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: call("a")),
+        single_flight.do("b", lambda: call("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert single_flight.calls == 2
+    assert single_flight.deduplicated == 0
+
+
+async def single_flight_starts_new_call_after_completion_test() -> None:
+    single_flight = SingleFlight()
+
+    async def call() -> str:
+        return "result"
+
+    await single_flight.do("key", call)
+    await single_flight.do("key", call)
+
+    assert single_flight.calls == 2
+    assert single_flight.deduplicated == 0
+
+
+async def single_flight_shares_exceptions_test() -> None:
+    single_flight = SingleFlight()
+
+    async def call() -> str:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", call) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.calls == 1
+    assert single_flight.in_flight == 0
+
+
+async def single_flight_caller_cancellation_does_not_cancel_others_test() -> None:
+    single_flight = SingleFlight()
+
+    async def call() -> str:
+        await asyncio.sleep(0.05)
+        return "result"
+
+    first = asyncio.ensure_future(single_flight.do("key", call))
+    second = asyncio.ensure_future(single_flight.do("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == "result"
@@ -0,0 +1,87 @@
+import asyncio
+import time
+import pytest
+from translategram.translategram.streaming import split_text, stream_translation
+
+TEXT = (
+    "First sentence. Second one! Third?\n\n"
+    "New paragraph here. And more text that is long enough to matter.\n\n\n"
+    "Last."
+)
+
+
+@pytest.mark.parametrize("max_chars", [1000, 40, 10, 5, 1])
+def split_text_round_trips_test(max_chars) -> None:
+    chunks = split_text(TEXT, max_chars)
+
+    assert "".join(chunk + separator for chunk, separator in chunks) == TEXT
+    assert all(len(chunk) <= max_chars for chunk, _ in chunks)
+
+
+def split_text_prefers_paragraph_and_sentence_boundaries_test() -> None:
+    assert split_text(TEXT, 40) == [
+        ("First sentence. Second one! Third?", "\n\n"),
+        ("New paragraph here. And more text that", " "),
+        ("is long enough to matter.", "\n\n\n"),
+        ("Last.", ""),
+    ]
+
+
+def split_text_keeps_short_text_whole_test() -> None:
+    assert split_text("Hello World", 1000) == [("Hello World", "")]
+
+
+def split_text_rejects_invalid_limit_test() -> None:
+    with pytest.raises(ValueError):
+        split_text(TEXT, 0)
+
+
+async def stream_translation_yields_chunks_in_order_test() -> None:
+    async def translate(chunk: str) -> str:
+        await asyncio.sleep(0.01 if chunk.startswith("First") else 0)
+        return chunk.upper()
+
+    chunks = [chunk async for chunk in stream_translation(TEXT, translate, max_chunk_chars=40)]
+
+    assert "".join(chunks) == TEXT.upper()
+    assert chunks[0] == "FIRST SENTENCE. SECOND ONE! THIRD?\n\n"
+
+
+async def stream_translation_delivers_first_chunk_early_test() -> None:
+    async def translate(chunk: str) -> str:
+        await asyncio.sleep(0.2 if chunk == "Last." else 0.01)
+        return chunk
+
+    start_time = time.perf_counter()
+    iterator = stream_translation(TEXT, translate, max_chunk_chars=40)
+    await iterator.__anext__()
+
+    assert time.perf_counter() - start_time < 0.15
+    await iterator.aclose()
+
+
+async def stream_translation_bounds_concurrency_and_cancels_on_close_test() -> None:
+    running = 0
+    max_running = 0
+    cancelled = 0
+
+    async def translate(chunk: str) -> str:
+        nonlocal running, max_running, cancelled
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        finally:
+            running -= 1
+        return chunk
+
+    iterator = stream_translation(TEXT, translate, max_chunk_chars=10, max_concurrency=2)
+    await iterator.__anext__()
+    await iterator.aclose()
+    await asyncio.sleep(0)
+
+    assert max_running == 2
+    assert cancelled > 0
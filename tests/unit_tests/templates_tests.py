@@ -0,0 +1,46 @@
+import pytest
+from translategram.translategram.templates import protect_placeholders, restore_placeholders
+
+TEMPLATE = "Hello {name!r}, you have {count:,} new {{messages}} from {user.name}"
+
+
+def protect_placeholders_numbers_placeholders_test() -> None:
+    protected, fields = protect_placeholders(TEMPLATE)
+
+    assert protected == "Hello {0}, you have {1} new {{messages}} from {2}"
+    assert fields == ("{name!r}", "{count:,}", "{user.name}")
+
+
+@pytest.mark.parametrize("template", ["Hello {}", "Hello {0}", "Hello {0.name}", "Hello {name"])
+def protect_placeholders_rejects_positional_and_malformed_templates_test(template) -> None:
+    with pytest.raises(ValueError):
+        protect_placeholders(template)
+
+
+def restore_placeholders_round_trips_test() -> None:
+    protected, fields = protect_placeholders(TEMPLATE)
+
+    assert restore_placeholders(protected, fields) == TEMPLATE
+
+
+def restore_placeholders_handles_reordered_and_padded_tokens_test() -> None:
+    _, fields = protect_placeholders(TEMPLATE)
+    translated = "De {2}: { 1 } nouveaux {{messages}} pour {0}"
+
+    template = restore_placeholders(translated, fields)
+
+    assert template == "De {user.name}: {count:,} nouveaux {{messages}} pour {name!r}"
+    assert template.format_map({"name": "Ann", "count": 1200, "user": type("User", (), {"name": "Bob"})}) == (
+        "De Bob: 1,200 nouveaux {messages} pour 'Ann'"
+    )
+
+
+@pytest.mark.parametrize(
+    "translated",
+    ["{0} {1}", "{0} {1} {1} {2}", "{0} {1} {3}", "{0} {1} {name}", "{0} {1} {2:>5}", "{0} {1} {2"],
+)
+def restore_placeholders_rejects_mangled_tokens_test(translated) -> None:
+    _, fields = protect_placeholders(TEMPLATE)
+
+    with pytest.raises(ValueError):
+        restore_placeholders(translated, fields)
@@ -1,5 +1,19 @@
+import asyncio
+import gc
 import time
+import urllib.error
 import pytest
+import httpx
+from translategram.translategram.translator_services import (
+    FallbackTranslatorService,
+    HttpTranslatorService,
+    MtranslateTranslatorService,
+    RateLimitedTranslatorService,
+    TranslatorServiceError,
+    is_untranslatable_error,
+    translate_batch,
+)
+from tests.fake_server import FakeHTTPError, FakeTranslationServer
 
 
 async def mtranslate_translate_str_returns_str_test(mtranslate_service) -> None:
@@ -102,3 +116,393 @@ async def mtranslate_translate_str_performance_test(mtranslate_service):
     assert (
         avg_elapsed_time < performance_threshold
     ), f"Average elapsed time exceeded threshold of {performance_threshold} sec"
+
+
+async def mtranslate_executor_does_not_block_event_loop_test(blocking_mtranslate):
+    service = MtranslateTranslatorService(max_workers=8)
+    service.service = blocking_mtranslate
+
+    start_time = time.monotonic()
+    results = await asyncio.gather(
+        *(service.translate_str(f"text {i}", "es", "en") for i in range(8))
+    )
+    elapsed_time = time.monotonic() - start_time
+    service.close()
+
+    assert results == [f"es:text {i}" for i in range(8)]
+    assert elapsed_time < blocking_mtranslate.latency * 4
+
+
+async def mtranslate_executor_respects_concurrency_cap_test(blocking_mtranslate):
+    service = MtranslateTranslatorService(max_workers=8, max_concurrency=2)
+    service.service = blocking_mtranslate
+
+    await asyncio.gather(*(service.translate_str("text", "es") for _ in range(6)))
+    service.close()
+
+    assert blocking_mtranslate.max_running == 2
+
+
+async def mtranslate_executor_timeout_test(blocking_mtranslate):
+    blocking_mtranslate.latency = 0.2
+    service = MtranslateTranslatorService(max_workers=1, timeout=0.01)
+    service.service = blocking_mtranslate
+
+    with pytest.raises(asyncio.TimeoutError):
+        await service.translate_str("text", "es")
+    service.close()
+
+
+async def mtranslate_executor_timed_out_calls_count_against_cap_test(blocking_mtranslate):
+    blocking_mtranslate.latency = 0.2
+    service = MtranslateTranslatorService(max_workers=4, max_concurrency=1, timeout=0.01)
+    service.service = blocking_mtranslate
+
+    with pytest.raises(asyncio.TimeoutError):
+        await service.translate_str("text", "es")
+    blocking_mtranslate.latency = 0.0
+    assert await service.translate_str("text", "es") == "es:text"
+    service.close()
+
+    assert blocking_mtranslate.max_running == 1
+
+
+async def mtranslate_translate_str_after_close_raises_error_test(blocking_mtranslate):
+    service = MtranslateTranslatorService(max_workers=1)
+    service.service = blocking_mtranslate
+    await service.aclose()
+
+    with pytest.raises(RuntimeError):
+        await service.translate_str("text", "es")
+
+
+async def http_translate_str_test(http_service) -> None:
+    result = await http_service.translate_str("Hello & <World>", "es", "en")
+    assert result == "HELLO & <WORLD>"
+
+
+async def http_translate_str_handles_empty_string_test(http_service) -> None:
+    assert await http_service.translate_str("", "es") == ""
+
+
+async def http_translate_str_reuses_connections_test(
+    http_service, fake_translation_server
+) -> None:
+    for i in range(5):
+        await http_service.translate_str(f"text {i}", "es")
+
+    assert fake_translation_server.requests == 5
+    assert fake_translation_server.connections == 1
+
+
+async def http_translate_str_raises_error_on_invalid_input_test(http_service):
+    with pytest.raises(TypeError):
+        await http_service.translate_str(123, "en")
+
+
+async def http_translate_str_raises_error_on_connection_error_test() -> None:
+    service = HttpTranslatorService(base_url="http://127.0.0.1:1")
+    with pytest.raises(httpx.ConnectError):
+        await service.translate_str("Hello", "es")
+    await service.aclose()
+
+
+async def mtranslate_translate_batch_keeps_order_test(blocking_mtranslate) -> None:
+    service = MtranslateTranslatorService(max_workers=4)
+    service.service = blocking_mtranslate
+
+    result = await service.translate_batch(["one", "two", "three"], "es")
+
+    assert result == ["es:one", "es:two", "es:three"]
+    service.close()
+
+
+async def translate_batch_falls_back_to_translate_str_test() -> None:
+    class SingleStringService:
+        async def translate_str(self, text, target_language, source_language="auto"):
+            return f"{target_language}:{text}"
+
+    result = await translate_batch(SingleStringService(), ["one", "two"], "es")
+
+    assert result == ["es:one", "es:two"]
+
+
+async def http_translate_batch_packs_segments_into_one_request_test(
+    http_service, fake_translation_server
+) -> None:
+    texts = ["Start", "", "Settings", "Help & <support>", "Quit"]
+
+    result = await http_service.translate_batch(texts, "es")
+
+    assert result == ["START", "", "SETTINGS", "HELP & <SUPPORT>", "QUIT"]
+    assert fake_translation_server.requests == 1
+
+
+async def http_translate_batch_respects_size_limit_test(fake_translation_server) -> None:
+    service = HttpTranslatorService(base_url=fake_translation_server.base_url, max_batch_chars=20)
+    texts = [f"segment {i}" for i in range(6)]
+
+    result = await service.translate_batch(texts, "es")
+
+    assert result == [text.upper() for text in texts]
+    assert fake_translation_server.requests == 3
+    await service.aclose()
+
+
+async def http_translate_batch_sends_multiline_segments_alone_test(
+    http_service, fake_translation_server
+) -> None:
+    result = await http_service.translate_batch(["one", "two\nlines", "three"], "es")
+
+    assert result == ["ONE", "TWO\nLINES", "THREE"]
+    assert fake_translation_server.requests == 2
+
+
+def failing_translation(text: str, target_language: str, source_language: str) -> str:
+    if "bad" in text:
+        raise ValueError(text)
+    return text.upper()
+
+
+async def http_translate_batch_handles_partial_failures_test() -> None:
+    with FakeTranslationServer(translate=failing_translation) as server:
+        service = HttpTranslatorService(base_url=server.base_url)
+
+        result = await service.translate_batch(["one", "bad", "two"], "es", return_exceptions=True)
+
+        assert result[0] == "ONE"
+        assert isinstance(result[1], TranslatorServiceError)
+        assert result[1].status_code == 500
+        assert result[2] == "TWO"
+        with pytest.raises(TranslatorServiceError):
+            await service.translate_batch(["one", "bad"], "es")
+        await service.aclose()
+
+
+class RecordingTranslatorService:
+    def __init__(self, errors=()) -> None:
+        self.errors = list(errors)
+        self.calls = []
+
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls.append((text, target_language))
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"{target_language}:{text}"
+
+
+async def rate_limited_limits_call_rate_test() -> None:
+    service = RateLimitedTranslatorService(RecordingTranslatorService(), rate=50, burst=1)
+    start_time = time.perf_counter()
+
+    await asyncio.gather(*(service.translate_str(f"text {i}", "es") for i in range(6)))
+
+    assert time.perf_counter() - start_time >= 0.09
+    assert service.calls == 6
+    assert service.max_wait > 0
+    assert service.queue_depth == 0
+
+
+async def rate_limited_is_fair_across_languages_test() -> None:
+    recording = RecordingTranslatorService()
+    service = RateLimitedTranslatorService(recording, rate=200, burst=1)
+
+    await asyncio.gather(
+        *(service.translate_str(f"text {i}", "es") for i in range(5)),
+        service.translate_str("text", "fr"),
+    )
+
+    assert [language for _, language in recording.calls].index("fr") <= 2
+
+
+async def rate_limited_retries_retryable_errors_test() -> None:
+    recording = RecordingTranslatorService(
+        [TranslatorServiceError("busy", status_code=503), OSError("reset")]
+    )
+    service = RateLimitedTranslatorService(recording, rate=1000, base_delay=0.001)
+
+    assert await service.translate_str("text", "es") == "es:text"
+    assert service.retries == 2
+
+
+async def rate_limited_does_not_retry_other_errors_test() -> None:
+    recording = RecordingTranslatorService([TranslatorServiceError("bad", status_code=400)])
+    service = RateLimitedTranslatorService(recording, rate=1000, base_delay=0.001)
+
+    with pytest.raises(TranslatorServiceError):
+        await service.translate_str("text", "es")
+    assert service.retries == 0
+
+
+async def rate_limited_gives_up_after_max_retries_test() -> None:
+    recording = RecordingTranslatorService([OSError("reset")] * 5)
+    service = RateLimitedTranslatorService(recording, rate=1000, max_retries=2, base_delay=0.001)
+
+    with pytest.raises(OSError):
+        await service.translate_str("text", "es")
+    assert len(recording.calls) == 3
+
+
+async def rate_limited_close_fails_queued_calls_test() -> None:
+    service = RateLimitedTranslatorService(RecordingTranslatorService(), rate=1, burst=1)
+    calls = [asyncio.ensure_future(service.translate_str(f"text {i}", "es")) for i in range(3)]
+    await asyncio.sleep(0.01)
+    await service.aclose()
+
+    results = await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), timeout=1)
+    assert results[0] == "es:text 0"
+    assert all(isinstance(result, RuntimeError) for result in results[1:])
+    assert service.queue_depth == 0
+    with pytest.raises(RuntimeError):
+        await service.translate_str("text", "es")
+
+
+async def rate_limited_backs_off_on_http_429_test() -> None:
+    responses = [FakeHTTPError(429, {"Retry-After": "0"}), FakeHTTPError(429)]
+
+    def throttling_translation(text, target_language, source_language):
+        if responses:
+            raise responses.pop(0)
+        return text.upper()
+
+    with FakeTranslationServer(translate=throttling_translation) as server:
+        service = RateLimitedTranslatorService(
+            HttpTranslatorService(base_url=server.base_url), rate=100, base_delay=0.001
+        )
+
+        assert await service.translate_str("text", "es") == "TEXT"
+        assert service.throttled == 2
+        assert service.retries == 2
+        assert service.current_rate < service.rate
+        await service.aclose()
+
+
+class DelayedTranslatorService:
+    def __init__(self, name: str, delay: float = 0.0, error=None) -> None:
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def translate_str(self, text, target_language, source_language="auto"):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}:{text}"
+
+
+async def fallback_uses_first_service_when_fast_test() -> None:
+    primary = DelayedTranslatorService("primary")
+    secondary = DelayedTranslatorService("secondary")
+    service = FallbackTranslatorService([primary, secondary], hedge_delay=0.1)
+
+    assert await service.translate_str("text", "es") == "primary:text"
+    assert secondary.calls == 0
+    assert service.wins == [1, 0]
+    assert service.hedge_rate == 0
+
+
+async def fallback_tries_next_service_on_error_test() -> None:
+    primary = DelayedTranslatorService("primary", error=OSError("down"))
+    secondary = DelayedTranslatorService("secondary")
+    service = FallbackTranslatorService([primary, secondary], hedge_delay=10)
+
+    assert await service.translate_str("text", "es") == "secondary:text"
+    assert service.fallbacks == 1
+    assert service.win_rates == [0.0, 1.0]
+
+
+async def fallback_prefers_success_finishing_with_a_failure_test() -> None:
+    release = asyncio.Event()
+
+    class GatedTranslatorService(DelayedTranslatorService):
+        async def translate_str(self, text, target_language, source_language="auto"):
+            self.calls += 1
+            await release.wait()
+            if self.error is not None:
+                raise self.error
+            return f"{self.name}:{text}"
+
+    primary = GatedTranslatorService("primary", error=OSError("down"))
+    secondary = GatedTranslatorService("secondary")
+    tertiary = GatedTranslatorService("tertiary")
+    service = FallbackTranslatorService([primary, secondary, tertiary], hedge_delay=0.01)
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    call = asyncio.ensure_future(service.translate_str("text", "es"))
+    await asyncio.sleep(0.015)
+    release.set()
+
+    assert await call == "secondary:text"
+    del call
+    gc.collect()
+    loop.set_exception_handler(None)
+    assert unhandled == []
+    assert tertiary.calls == 0
+    assert service.fallbacks == 0
+
+
+async def fallback_raises_last_error_when_all_fail_test() -> None:
+    service = FallbackTranslatorService(
+        [
+            DelayedTranslatorService("primary", error=OSError("down")),
+            DelayedTranslatorService("secondary", error=ValueError("bad")),
+        ]
+    )
+
+    with pytest.raises(ValueError):
+        await service.translate_str("text", "es")
+
+
+async def fallback_hedges_slow_first_service_test() -> None:
+    primary = DelayedTranslatorService("primary", delay=1.0)
+    secondary = DelayedTranslatorService("secondary", delay=0.01)
+    service = FallbackTranslatorService([primary, secondary], hedge_delay=0.02)
+    start_time = time.perf_counter()
+
+    assert await service.translate_str("text", "es") == "secondary:text"
+    assert time.perf_counter() - start_time < 0.5
+    assert service.hedges == 1
+    assert service.wins == [0, 1]
+    await asyncio.sleep(0)
+    assert primary.cancelled == 1
+
+
+async def fallback_hedge_delay_follows_p95_latency_test() -> None:
+    primary = DelayedTranslatorService("primary", delay=0.01)
+    service = FallbackTranslatorService(
+        [primary, DelayedTranslatorService("secondary")],
+        initial_hedge_delay=5.0,
+        min_hedge_delay=0.001,
+        min_samples=5,
+    )
+    assert service.hedge_delay == 5.0
+
+    for _ in range(5):
+        await service.translate_str("text", "es")
+
+    assert 0.005 < service.hedge_delay < 0.5
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (TranslatorServiceError("bad language", status_code=400), True),
+        (TranslatorServiceError("not found", status_code=404), False),
+        (TranslatorServiceError("forbidden", status_code=403), False),
+        (TranslatorServiceError("slow down", status_code=429), False),
+        (TranslatorServiceError("unavailable", status_code=503), False),
+        (TranslatorServiceError("no status"), False),
+        (urllib.error.HTTPError("http://example.com", 400, "Bad Request", None, None), True),
+        (OSError("connection reset"), False),
+    ],
+)
+def is_untranslatable_error_test(exc, expected) -> None:
+    assert is_untranslatable_error(exc) is expected
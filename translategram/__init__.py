@@ -1,5 +1,71 @@
-from translategram.python_telegram_bot_translator.adapter import (
-    PythonTelegramBotAdapter as PythonTelegramBotTranslator,
-)
-from translategram.translategram.translator_services import MtranslateTranslatorService
-from translategram.translategram.cache import PickleCache
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from translategram.python_telegram_bot_translator.adapter import (
+        PythonTelegramBotAdapter as PythonTelegramBotTranslator,
+    )
+    from translategram.translategram.translator_services import (
+        FallbackTranslatorService,
+        HttpTranslatorService,
+        MtranslateTranslatorService,
+        RateLimitedTranslatorService,
+        TranslatorServiceError,
+    )
+    from translategram.translategram.cache import (
+        AppendOnlyCache,
+        BundleCache,
+        MemoryCache,
+        PickleCache,
+        SQLiteCache,
+        TieredCache,
+        write_bundle,
+    )
+    from translategram.translategram.languages import LanguageResolver
+    from translategram.translategram.metrics import NoOpMetrics, PrometheusMetrics
+
+# Public names are imported on first access, so a worker using only the cache or service layers does not import
+# python-telegram-bot.
+_exports: Dict[str, Tuple[str, str]] = {
+    "PythonTelegramBotTranslator": ("translategram.python_telegram_bot_translator.adapter", "PythonTelegramBotAdapter"),
+    **{
+        name: ("translategram.translategram.translator_services", name)
+        for name in (
+            "FallbackTranslatorService",
+            "HttpTranslatorService",
+            "MtranslateTranslatorService",
+            "RateLimitedTranslatorService",
+            "TranslatorServiceError",
+        )
+    },
+    **{
+        name: ("translategram.translategram.cache", name)
+        for name in (
+            "AppendOnlyCache",
+            "BundleCache",
+            "MemoryCache",
+            "PickleCache",
+            "SQLiteCache",
+            "TieredCache",
+            "write_bundle",
+        )
+    },
+    "LanguageResolver": ("translategram.translategram.languages", "LanguageResolver"),
+    "NoOpMetrics": ("translategram.translategram.metrics", "NoOpMetrics"),
+    "PrometheusMetrics": ("translategram.translategram.metrics", "PrometheusMetrics"),
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _exports[name]
+    value = getattr(importlib.import_module(module), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
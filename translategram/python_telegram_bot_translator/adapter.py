@@ -1,11 +1,39 @@
+import asyncio
 import inspect
-from typing import Any, Coroutine, Callable, Type, Union
+import json
+import time
+from typing import Any, Awaitable, Coroutine, Callable, Dict, Iterable, Mapping, NamedTuple, Set, Tuple, Type, Union
 from telegram.ext import ContextTypes
 from telegram import Update
-from translategram.translategram.cache import Cache
-from translategram.translategram.translator_services import TranslatorService
+from translategram.translategram.cache import Cache, MemoryCache, make_cache_key, write_bundle
+from translategram.translategram.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+from translategram.translategram.languages import LanguageResolver, detect_language, same_language
+from translategram.translategram.metrics import Metrics, NoOpMetrics
+from translategram.translategram.single_flight import SingleFlight
+from translategram.translategram.streaming import stream_translation
+from translategram.translategram.templates import protect_placeholders, restore_placeholders
+from translategram.translategram.translator_services import TranslatorService, is_untranslatable_error
 from translategram.translategram.translator import Translator
 
+UNSUPPORTED_LANGUAGES_KEY = "translategram:unsupported-languages"
+
+
+def _has_letters(message: str) -> bool:
+    return any(char.isalpha() for char in message)
+
+
+class WarmUpReport(NamedTuple):
+    """
+    The outcome of `PythonTelegramBotAdapter.warm_up`.
+    """
+
+    translated: int
+    cached: int
+    failed: int
+    rejected: int
+    fallbacks: int
+    elapsed: float
+
 
 class PythonTelegramBotAdapter(Translator):
     """
@@ -17,90 +45,547 @@ class PythonTelegramBotAdapter(Translator):
 
     def __init__(
         self,
-        translator_service: Type[TranslatorService],
+        translator_service: Union[Type[TranslatorService], Callable[[], TranslatorService]],
         cache_system: Union[Type[Cache], None] = None,
+        circuit_breaker: Union[CircuitBreaker, None] = None,
+        stale_while_revalidate: bool = False,
+        max_refreshes: int = 4,
+        language_resolver: Union[LanguageResolver, None] = None,
+        metrics: Union[Metrics, None] = None,
+        negative_ttl: float = 300.0,
+        unsupported_language_threshold: Union[int, None] = 3,
+        unsupported_language_ttl: float = 86400.0,
+        unsupported_languages_cache: Union[Cache, None] = None,
     ) -> None:
         """
         Initializes a new PythonTelegramBotAdapter instance using the specified `translator_service`.
 
-        :param translator_service: The `TranslatorService` to use for translations.
+        :param translator_service: The `TranslatorService` class to use for translations, or a zero-argument
+            factory for a configured one (e.g. `functools.partial(MtranslateTranslatorService, max_workers=8)`).
         :param cache_system: The cache system to be used for caching translations. If None, caching is disabled.
+        :param circuit_breaker: Guards the translator service. With a breaker, a failed or rejected translation
+            falls back to a stale cached translation if the cache system has one (`retrieve_stale`), or else to
+            the untranslated message, instead of raising.
+        :param stale_while_revalidate: Whether an expired translation the cache system still keeps
+            (`retrieve_stale`) is sent right away and refreshed in the background, instead of waiting for a new one.
+        :param max_refreshes: The maximum number of background refreshes running at once.
+        :param language_resolver: Resolves each user's language, honouring the languages users picked and
+            mapping client language codes to supported ones. If None, the client language code is used as is.
+        :param metrics: Records stage latencies, cache hits per language and upstream errors, e.g. a
+            `PrometheusMetrics`. If None, nothing is recorded.
+        :param negative_ttl: Seconds a message the translator service rejected (see `is_untranslatable_error`) is
+            sent untranslated without asking the service again. 0 disables it.
+        :param unsupported_language_threshold: The number of different messages rejected for a language, with
+            none translated, after which the language is deemed unsupported: its messages are then sent
+            untranslated for `unsupported_language_ttl` seconds. None disables it.
+        :param unsupported_language_ttl: Seconds a language stays deemed unsupported.
+        :param unsupported_languages_cache: The cache persisting the languages deemed unsupported, per translator
+            service, so they are remembered across restarts. It is kept apart from the translations. If None, they
+            are forgotten on restart.
+        :raises ValueError: If `max_refreshes`, `unsupported_language_threshold` or `unsupported_language_ttl` is
+            not positive, or `negative_ttl` is negative.
         """
+        if max_refreshes < 1:
+            raise ValueError("`max_refreshes` must be a positive integer")
+        if negative_ttl < 0 or (unsupported_language_threshold is not None and unsupported_language_threshold < 1):
+            raise ValueError(
+                "`negative_ttl` must not be negative and `unsupported_language_threshold` must be a positive integer"
+            )
+        if unsupported_language_ttl <= 0:
+            raise ValueError("`unsupported_language_ttl` must be positive")
         self._translator_service = translator_service()
         self._cache_system = cache_system
+        self._circuit_breaker = circuit_breaker
+        self._stale_while_revalidate = stale_while_revalidate
+        self._language_resolver = language_resolver
+        self._metrics: Metrics = metrics if metrics is not None else NoOpMetrics()
+        self._refresh_semaphore = asyncio.Semaphore(max_refreshes)
+        self._refreshes: Dict[str, "asyncio.Task[None]"] = {}
+        self.refresh_failures = 0
+        self.skipped_translations = 0
+        self.template_fallbacks = 0
+        self._negative_cache = MemoryCache(ttl=negative_ttl) if negative_ttl else None
+        self._unsupported_language_threshold = unsupported_language_threshold
+        self._unsupported_language_ttl = unsupported_language_ttl
+        self._unsupported_languages_cache = unsupported_languages_cache
+        self._unsupported_languages: Union[Dict[str, float], None] = None
+        self._rejections: Dict[str, Set[str]] = {}
+        self._translated_languages: Set[str] = set()
+        self._single_flight = SingleFlight()
+        self._messages: Dict[Tuple[str, str], None] = {}
+        self._service_id = str(
+            getattr(self._translator_service, "service_id", type(self._translator_service).__name__)
+        )
+        self._unsupported_languages_key = f"{UNSUPPORTED_LANGUAGES_KEY}:{self._service_id}"
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """
+        The coalescing layer shared by all wrapped handlers. Its `calls` and `deduplicated` counters show
+        how many upstream translations were made and how many concurrent identical ones were spared.
+        """
+        return self._single_flight
+
+    @property
+    def metrics(self) -> Metrics:
+        """
+        The metrics the adapter records into.
+        """
+        return self._metrics
+
+    @property
+    def unsupported_languages(self) -> Tuple[str, ...]:
+        """
+        The languages deemed unsupported by the translator service, whose messages are sent untranslated.
+        """
+        now = time.time()
+        unsupported_languages = self._unsupported_languages or {}
+        return tuple(sorted(lang for lang, expires_at in unsupported_languages.items() if expires_at > now))
+
+    @property
+    def messages(self) -> Tuple[Tuple[str, str], ...]:
+        """
+        The `(message, source_lang)` pairs of every handler decorated with `handler_translator`, in order.
+        """
+        return tuple(self._messages)
+
+    async def warm_up(
+        self,
+        languages: Iterable[str],
+        max_concurrency: int = 8,
+        progress: Union[Callable[[int, int], object], None] = None,
+    ) -> WarmUpReport:
+        """
+        Translates every registered static message into `languages` and stores the results in the cache,
+        so the first user in each language does not wait for the translator service.
+
+        Call it before polling starts, for instance from python-telegram-bot's `post_init` hook. Only translations
+        stored in the cache count as translated. Failed translations, messages the translator service rejected
+        (now or within `negative_ttl`, or in a language deemed unsupported) and messages skipped because the
+        circuit breaker is open are counted apart; they are retried when a user needs them. The language codes go
+        through the language resolver, if any, like the users' ones, and messages that would be sent as they are
+        in a language (already in it, or without letters) are left out.
+
+        :param languages: The language codes to translate into.
+        :param max_concurrency: The maximum number of translations in flight.
+        :param progress: Called with `(done, total)` after each message and language.
+        :return: How many translations were made, already cached, failed, rejected or skipped by the circuit
+            breaker, and how long it took.
+        :raises RuntimeError: If the adapter has no cache system.
+        :raises ValueError: If `max_concurrency` is not positive.
+        """
+        if self._cache_system is None:
+            raise RuntimeError("`warm_up` requires a cache system")
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be a positive integer")
+        cache_system = self._cache_system
+        resolver = self._language_resolver
+        if resolver is not None:
+            languages = [resolver.resolve_code(lang) for lang in languages]
+        jobs = [
+            (message, source_lang, lang)
+            for message, source_lang in self._messages
+            for lang in dict.fromkeys(languages)
+            if not self._is_sent_as_is(lang, message, source_lang)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        counts = {"translated": 0, "cached": 0, "failed": 0, "rejected": 0, "fallbacks": 0}
+        done = 0
+        start = time.perf_counter()
+
+        async def warm(message: str, source_lang: str, user_lang: str) -> None:
+            nonlocal done
+            async with semaphore:
+                key = make_cache_key(message, source_lang, user_lang, self._service_id)
+                try:
+                    if await cache_system.retrieve(key=key):  # type: ignore
+                        counts["cached"] += 1
+                    elif await self._is_unsupported_language(user_lang) or (
+                        self._negative_cache is not None and await self._negative_cache.retrieve(key) is not None
+                    ):
+                        counts["rejected"] += 1
+                    elif await self._single_flight.do(
+                        key, lambda: self._translate_and_store(key, user_lang, message, source_lang)
+                    ) is None:
+                        counts["rejected"] += 1
+                    else:
+                        counts["translated"] += 1
+                except CircuitBreakerOpen:
+                    counts["fallbacks"] += 1
+                except Exception:
+                    counts["failed"] += 1
+            done += 1
+            if progress is not None:
+                progress(done, len(jobs))
+
+        await asyncio.gather(*(warm(*job) for job in jobs))
+        return WarmUpReport(elapsed=time.perf_counter() - start, **counts)
+
+    async def reset_unsupported_languages(self, languages: Union[Iterable[str], None] = None) -> None:
+        """
+        Forgets that languages were deemed unsupported, and the rejected messages remembered for `negative_ttl`,
+        so they are sent to the translator service again, e.g. after its configuration was fixed.
+
+        :param languages: The languages to forget. If None, every language is forgotten.
+        """
+        unsupported_languages = await self._get_unsupported_languages()
+        for lang in list(unsupported_languages) if languages is None else languages:
+            unsupported_languages.pop(lang, None)
+            self._rejections.pop(lang, None)
+        if languages is None:
+            self._rejections.clear()
+        if self._negative_cache is not None:
+            self._negative_cache.clear()
+        await self._store_unsupported_languages()
+
+    async def export_bundle(self, filename: str) -> int:
+        """
+        Writes every translation in the cache system to a bundle file. Serve it on other nodes by passing
+        `BundleCache(filename)` as their cache system.
+
+        :param filename: The name of the bundle file.
+        :return: The number of translations written.
+        :raises RuntimeError: If the adapter has no cache system or the cache system cannot list its entries.
+        """
+        items = getattr(self._cache_system, "items", None)
+        if items is None:
+            raise RuntimeError("`export_bundle` requires a cache system with an `items` method")
+        return write_bundle(filename, await items())
+
+    async def aclose(self) -> None:
+        """
+        Releases the resources held by the translator service and the cache system, e.g. a thread pool,
+        HTTP connections, cache writes still waiting to be flushed or open files, with their `aclose` or `close`.
+
+        Call it on application shutdown, for instance from python-telegram-bot's `post_shutdown` hook.
+        """
+        for refresh in list(self._refreshes.values()):
+            refresh.cancel()
+        for resource in (self._translator_service, self._cache_system):
+            aclose = getattr(resource, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            else:
+                close = getattr(resource, "close", None)
+                if close is not None:
+                    close()
 
     async def _get_message_from_cache(
         self,
-        func: Callable[[Update, ContextTypes.DEFAULT_TYPE, str], object],
         user_lang: str,
         message: str,
         source_lang: str,
+        key: str = "",
     ) -> str:
         """
         Gets the message from the cache system.
 
-        :param func: The handler function that is used for handling commands by the Python-telegram-bot framework.
+        Entries are keyed on the message text, both languages and the translator service (see `make_cache_key`),
+        so handlers sending the same text share one entry. Concurrent misses for the same key share a single
+        translation and cache store. With a circuit breaker, a translation that fails or is rejected falls back
+        to a stale cached translation or the untranslated message. With `stale_while_revalidate`, a stale
+        translation is returned at once and refreshed in the background.
+
         :param user_lang: The language to translate the message to.
         :param message: The message to translate.
         :param source_lang: The language to translate the message from.
+        :param key: The cache key of the translation, if the caller already has it.
         :return: The message from the cache system.
         """
-        msg = await self._cache_system.retrieve(
-            key=func.__name__ + "_" + user_lang
-            ) if self._cache_system is not None else ""  # type: ignore
+        unsupported_languages = self._unsupported_languages
+        if (
+            unsupported_languages is None or user_lang in unsupported_languages
+        ) and await self._is_unsupported_language(user_lang):
+            self._metrics.increment("negative_hits", user_lang)
+            return message
+        if not key:
+            key = make_cache_key(message, source_lang, user_lang, self._service_id)
+        with self._metrics.stage("cache_retrieve"):
+            msg = await self._cache_system.retrieve(
+                key=key
+                ) if self._cache_system is not None else ""  # type: ignore
         if msg is None or msg == "":
-            msg = await self._translator_service.translate_str(
-                text=message,
-                target_language=user_lang,
-                source_language=source_lang,
-            )
+            if self._negative_cache is not None and await self._negative_cache.retrieve(key) is not None:
+                self._metrics.increment("negative_hits", user_lang)
+                return message
+            self._metrics.increment("cache_misses", user_lang)
+            if self._stale_while_revalidate:
+                stale = await self._get_stale_message(key)
+                if stale:
+                    self._metrics.increment("stale_hits", user_lang)
+                    self._schedule_refresh(key, user_lang, message, source_lang)
+                    return stale
+            try:
+                msg = await self._single_flight.do(
+                    key, lambda: self._translate_and_store(key, user_lang, message, source_lang)
+                )
+            except Exception:
+                if self._circuit_breaker is None:
+                    raise
+                msg = await self._get_fallback_message(key, message)
+            if msg is None:
+                msg = message
+        else:
+            self._metrics.increment("cache_hits", user_lang)
+        return msg
+
+    async def _translate_and_store(
+        self, key: str, user_lang: str, message: str, source_lang: str
+    ) -> Union[str, None]:
+        """
+        Translates the message through the circuit breaker, if any, and stores it in the cache system.
+
+        :param key: The cache key of the translation.
+        :param user_lang: The language to translate the message to.
+        :param message: The message to translate.
+        :param source_lang: The language to translate the message from.
+        :return: The translated message, or None if the translator service rejected it.
+        """
+
+        async def translate() -> Union[str, None]:
+            try:
+                with self._metrics.stage("translate"):
+                    return await self._translator_service.translate_str(
+                        text=message,
+                        target_language=user_lang,
+                        source_language=source_lang,
+                    )
+            except Exception as exc:
+                # A rejected request is answered by a healthy service, so the circuit breaker records a success.
+                if is_untranslatable_error(exc):
+                    return None
+                raise
+
+        translated = await (
+            self._circuit_breaker.call(translate) if self._circuit_breaker is not None else translate()
+        )
+        if translated is None:
+            await self._remember_rejection(key, user_lang)
+            return None
+        self._translated_languages.add(user_lang)
+        with self._metrics.stage("cache_store"):
             await self._cache_system.store(
-                key=func.__name__ + "_" + user_lang, value=msg
+                key=key, value=translated
             ) if self._cache_system is not None else ""  # type: ignore
-        return msg
+        return translated
+
+    async def _is_unsupported_language(self, user_lang: str) -> bool:
+        """
+        Tells whether `user_lang` is deemed unsupported, forgetting it once `unsupported_language_ttl` has passed.
+
+        :param user_lang: The language code to check.
+        :return: True if messages are sent untranslated to users with this language.
+        """
+        unsupported_languages = await self._get_unsupported_languages()
+        if user_lang not in unsupported_languages:
+            return False
+        if unsupported_languages[user_lang] > time.time():
+            return True
+        del unsupported_languages[user_lang]
+        self._rejections.pop(user_lang, None)
+        await self._store_unsupported_languages()
+        return False
+
+    async def _get_unsupported_languages(self) -> Dict[str, float]:
+        """
+        Gets the languages deemed unsupported, loading them from `unsupported_languages_cache` the first time.
+
+        :return: The time each unsupported language code expires at, as returned by `time.time`.
+        """
+        if self._unsupported_languages is None:
+            stored = await self._unsupported_languages_cache.retrieve(
+                self._unsupported_languages_key
+            ) if self._unsupported_languages_cache is not None else None
+            self._unsupported_languages = {
+                str(lang): float(expires_at) for lang, expires_at in json.loads(stored).items()
+            } if stored else {}
+        return self._unsupported_languages
+
+    async def _store_unsupported_languages(self) -> None:
+        """
+        Persists the languages deemed unsupported to `unsupported_languages_cache`, if any.
+        """
+        if self._unsupported_languages_cache is not None:
+            await self._unsupported_languages_cache.store(
+                self._unsupported_languages_key, json.dumps(self._unsupported_languages or {}, sort_keys=True)
+            )
+
+    async def _remember_rejection(self, key: str, user_lang: str) -> None:
+        """
+        Records that the translator service rejected a message, so it is not sent again for `negative_ttl` seconds,
+        and deems `user_lang` unsupported once enough different messages were rejected for it.
+
+        :param key: The cache key of the rejected translation.
+        :param user_lang: The language the message was to be translated to.
+        """
+        if self._negative_cache is not None:
+            await self._negative_cache.store(key, "")
+        if self._unsupported_language_threshold is None or user_lang in self._translated_languages:
+            return
+        rejected = self._rejections.setdefault(user_lang, set())
+        rejected.add(key)
+        if len(rejected) < self._unsupported_language_threshold:
+            return
+        unsupported_languages = await self._get_unsupported_languages()
+        unsupported_languages[user_lang] = time.time() + self._unsupported_language_ttl
+        await self._store_unsupported_languages()
+
+    def _schedule_refresh(
+        self, key: str, user_lang: str, message: str, source_lang: str
+    ) -> None:
+        """
+        Starts a background refresh of a stale translation, unless one is already running for `key`.
+
+        :param key: The cache key of the translation.
+        :param user_lang: The language to translate the message to.
+        :param message: The message to translate.
+        :param source_lang: The language to translate the message from.
+        """
+        if key in self._refreshes:
+            return
+
+        async def refresh() -> None:
+            try:
+                async with self._refresh_semaphore:
+                    await self._single_flight.do(
+                        key, lambda: self._translate_and_store(key, user_lang, message, source_lang)
+                    )
+            except Exception:
+                self.refresh_failures += 1
+            finally:
+                del self._refreshes[key]
+
+        self._refreshes[key] = asyncio.ensure_future(refresh())
+
+    async def _get_stale_message(self, key: str) -> Union[str, None]:
+        """
+        Gets an expired translation the cache system still keeps.
+
+        :param key: The cache key of the translation.
+        :return: The stale translation, or None if the cache system has none or cannot keep them.
+        """
+        retrieve_stale = getattr(self._cache_system, "retrieve_stale", None)
+        stale = await retrieve_stale(key) if retrieve_stale is not None else None
+        return str(stale) if stale else None
+
+    async def _get_fallback_message(self, key: str, message: str) -> str:
+        """
+        Gets the message to send when the translation is unavailable.
+
+        :param key: The cache key of the translation.
+        :param message: The untranslated message.
+        :return: A stale cached translation if the cache system keeps one, or else the untranslated message.
+        """
+        return await self._get_stale_message(key) or message
+
+    def _is_sent_as_is(self, user_lang: str, message: str, source_lang: str) -> bool:
+        """
+        Tells whether the message needs no translation into `user_lang`, being already in that language or
+        having no letters.
+
+        :param user_lang: The language to translate the message to.
+        :param message: The message to translate.
+        :param source_lang: The language to translate the message from.
+        :return: True if the message is sent untranslated.
+        """
+        detected_lang = detect_language(message) if source_lang == "auto" else source_lang
+        return (detected_lang is not None and same_language(detected_lang, user_lang)) or not _has_letters(message)
 
     async def _get_translated_message(
         self,
         user_lang: str,
         message: str,
-        func: Callable[[Update, ContextTypes.DEFAULT_TYPE, str], object],
         source_lang: str,
+        key: str = "",
     ) -> str:
         """
         Gets the translated message for the specified `user_lang` and `message`.
 
+        Messages already in `user_lang`, or without a single letter to translate (emoji, numbers), are returned as
+        they are, without touching the cache or the translator service, and counted in `skipped_translations`.
+        With `source_lang="auto"`, the message's language is guessed locally (see `detect_language`).
+
         :param user_lang: The language to translate the message to.
         :param message: The message to translate.
-        :param func: The handler function that is used for handling commands by the Python-telegram-bot framework.
         :param source_lang: The language to translate the message from.
+        :param key: The cache key of the translation, if the caller already has it.
         :return: The translated message.
         """
+        if self._is_sent_as_is(user_lang, message, source_lang):
+            self.skipped_translations += 1
+            self._metrics.increment("skipped_translations", user_lang)
+            return message
         msg = message
         if self._cache_system is not None:
             msg = await self._get_message_from_cache(
-                func, user_lang, message, source_lang
+                user_lang, message, source_lang, key
             )
         return msg
 
-    async def _return_handler_function(
+    async def _get_translated_template(
         self,
-        func: Callable[[Update, ContextTypes.DEFAULT_TYPE, str], object],
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        message: str,
-    ) -> Any:
+        user_lang: str,
+        template: str,
+        protected: str,
+        fields: Tuple[str, ...],
+        values: Mapping[str, Any],
+        source_lang: str,
+    ) -> str:
+        """
+        Gets the translated template for the specified `user_lang`, filled in with `values`.
+
+        The protected template is translated (and cached) once per language, whatever the values. If the
+        translator mangled its placeholders, the filled-in template is translated instead and the fallback is
+        counted in `template_fallbacks`. The mangled translation is dropped from the cache system, and the
+        template is translated again after `negative_ttl` seconds.
+
+        :param user_lang: The language to translate the template to.
+        :param template: The template, with named `str.format` placeholders.
+        :param protected: The template with its placeholders protected (see `protect_placeholders`).
+        :param fields: The placeholders of the template, as returned by `protect_placeholders`.
+        :param values: The placeholder values, inserted untranslated.
+        :param source_lang: The language to translate the template from.
+        :return: The translated message.
         """
-        Returns the handler function.
+        key = make_cache_key(protected, source_lang, user_lang, self._service_id)
+        mangled_key = f"mangled:{key}"
+        if self._negative_cache is None or await self._negative_cache.retrieve(mangled_key) is None:
+            translated = await self._get_translated_message(user_lang, protected, source_lang, key)
+            try:
+                return restore_placeholders(translated, fields).format_map(values)
+            except ValueError:
+                # An empty entry reads as a miss, so the next attempt translates the template again.
+                if self._cache_system is not None:
+                    await self._cache_system.store(key=key, value="")  # type: ignore
+                if self._negative_cache is not None:
+                    await self._negative_cache.store(mangled_key, "")
+        self.template_fallbacks += 1
+        return await self._get_translated_message(user_lang, template.format_map(values), source_lang)
+
+    def _handler_caller(
+        self, func: Callable[[Update, ContextTypes.DEFAULT_TYPE, Any], object]
+    ) -> Callable[[Update, ContextTypes.DEFAULT_TYPE, Any], Awaitable[Any]]:
+        """
+        Builds the coroutine function calling the handler function, checking once whether it is a coroutine
+        function rather than on every update.
 
         :param func: The handler function that is used for handling commands by the Python-telegram-bot framework.
-        :param update: The update object.
-        :param context: The context object.
-        :param message: The message to translate.
-        :return: The handler function's result.
+        :return: A coroutine function taking the update, the context and the message, returning the handler
+            function's result.
         """
         if inspect.iscoroutinefunction(func):
-            return await func(update, context, message)
-        return func(update, context, message)
+
+            async def call_async(update: Update, context: ContextTypes.DEFAULT_TYPE, message: Any) -> Any:
+                with self._metrics.stage("handler"):
+                    return await func(update, context, message)  # type: ignore
+
+            return call_async
+
+        async def call_sync(update: Update, context: ContextTypes.DEFAULT_TYPE, message: Any) -> Any:
+            with self._metrics.stage("handler"):
+                return func(update, context, message)
+
+        return call_sync
 
     async def _get_user_language(self, update: Update) -> str:
         """
@@ -109,28 +594,41 @@ class PythonTelegramBotAdapter(Translator):
         :param update: The update object.
         :return: The user's language.
         """
-        user_lang = (
-            update.effective_user.language_code if update.effective_user else "en"
-        )
-        return str(user_lang)
-
-    async def _get_message_func_result(
-        self,
-        message_func: Callable[[str, Update], str],
-        user_inp: str,
-        update: Union[Update, None] = None,
-    ) -> str:
-        if update:
-            return str(
-                await message_func(user_inp, update)
-                if inspect.iscoroutinefunction(message_func)
-                else message_func(user_inp, update)
+        with self._metrics.stage("resolve_language"):
+            if self._language_resolver is not None:
+                user = update.effective_user
+                return await self._language_resolver.resolve(
+                    user.id if user else None, user.language_code if user else None
+                )
+            user_lang = (
+                update.effective_user.language_code if update.effective_user else "en"
             )
-        return str(
-            await message_func(user_inp)  # type: ignore
-            if inspect.iscoroutinefunction(message_func)
-            else message_func(user_inp)  # type: ignore
-        )
+            return str(user_lang)
+
+    def _message_func_caller(self, message_func: Callable[..., Any]) -> Callable[[str, Update], Awaitable[Any]]:
+        """
+        Builds the coroutine function calling `message_func`, inspecting it once rather than on every update.
+
+        :param message_func: Builds the message from the user's input, and from the update too if one of its
+            annotations is the update's type.
+        :return: A coroutine function taking the user's input and the update, returning `message_func`'s result.
+        """
+        annotations = tuple(inspect.get_annotations(message_func).values())
+        if inspect.iscoroutinefunction(message_func):
+
+            async def call_async(user_inp: str, update: Update) -> Any:
+                if type(update) in annotations:
+                    return await message_func(user_inp, update)
+                return await message_func(user_inp)
+
+            return call_async
+
+        async def call_sync(user_inp: str, update: Update) -> Any:
+            if type(update) in annotations:
+                return message_func(user_inp, update)
+            return message_func(user_inp)
+
+        return call_sync
 
     def handler_translator(
         self, message: str, source_lang: str = "auto"
@@ -157,6 +655,10 @@ class PythonTelegramBotAdapter(Translator):
             :param func: The handler function that is used for handling commands by the Python-telegram-bot framework.
             :return: A coroutine that wraps the handler function and provides translation functionality.
             """
+            self._messages[(message, source_lang)] = None
+            call_handler = self._handler_caller(func)
+            static_message = message
+            keys: Dict[str, str] = {}
 
             async def wrapper(
                 update: Update,
@@ -164,15 +666,18 @@ class PythonTelegramBotAdapter(Translator):
                 message: str = message,
             ) -> Any:
                 user_lang = await self._get_user_language(update=update)
+                key = ""
+                if message == static_message:
+                    key = keys.get(user_lang, "")
+                    if not key:
+                        key = keys[user_lang] = make_cache_key(message, source_lang, user_lang, self._service_id)
                 message = await self._get_translated_message(
-                    user_lang=str(user_lang),
+                    user_lang=user_lang,
                     message=message,
-                    func=func,
                     source_lang=source_lang,
+                    key=key,
                 )
-                return await self._return_handler_function(
-                    func=func, update=update, context=context, message=message
-                )
+                return await call_handler(update, context, message)
 
             return wrapper
 
@@ -180,33 +685,85 @@ class PythonTelegramBotAdapter(Translator):
 
     def dynamic_handler_translator(
         self,
-        message_func: Callable[[str, Any], str],
+        message_func: Callable[[str, Any], Any],
         source_lang: str = "auto",
+        stream: bool = False,
+        max_chunk_chars: int = 1000,
+        max_concurrency: int = 4,
+        template: Union[str, None] = None,
     ) -> Callable[
         [Callable[..., object]], Callable[[Any, Any], Coroutine[Any, Any, Any]]
     ]:
+        """
+        A decorator that wraps a python-telegram-bot `handler` function to translate a message built from the
+        user's input by `message_func`.
+
+        With `stream`, the handler receives an async iterator instead of a string: the message is split at
+        paragraph and sentence boundaries, the chunks are translated concurrently, and each translated chunk is
+        yielded as soon as it is ready, so the handler can send or edit its reply while the rest is translated.
+
+        With `template`, `message_func` returns the values of the template's named `{placeholders}` instead of the
+        message. Only the static template is translated, once per language, with its placeholders protected from
+        the translator; the values are filled in afterwards, untranslated. The protected template is registered
+        like a `handler_translator` message, so `warm_up` translates it too.
+
+        :param message_func: Builds the message from the user's input (and the update, if it accepts one), or the
+            placeholder values as a mapping in `template` mode.
+        :param source_lang: The language to translate the message from.
+        :param stream: Whether the handler receives the translation as an async iterator of chunks.
+        :param max_chunk_chars: The maximum length of a chunk in `stream` mode.
+        :param max_concurrency: The maximum number of chunks translated at once in `stream` mode.
+        :param template: A `str.format` template with named placeholders, e.g. `"Hello {name}!"`.
+        :return: A coroutine that wraps the handler function and provides translation functionality.
+        :raises ValueError: If `template` is malformed or has positional placeholders, or is combined with `stream`.
+        """
+        if template is not None and stream:
+            raise ValueError("`template` cannot be combined with `stream`")
+        protected, fields = protect_placeholders(template) if template is not None else ("", ())
+
         def decorator(
             func: Callable[[Update, ContextTypes.DEFAULT_TYPE, str], object]
         ) -> Callable[[Any, Any], Coroutine[Any, Any, Any]]:
+            if template is not None:
+                self._messages[(protected, source_lang)] = None
+            call_handler = self._handler_caller(func)
+            call_message_func = self._message_func_caller(message_func)
+
             async def wrapper(
                 update: Update,
                 context: ContextTypes.DEFAULT_TYPE,
             ) -> Any:
                 user_inp = " ".join(context.args) if context.args else ""
-                args = [user_inp]
-                if type(update) in inspect.get_annotations(message_func).values():
-                    args.append(update)  # type: ignore
-                message = await self._get_message_func_result(message_func, *args)  # type: ignore
+                result = await call_message_func(user_inp, update)
                 user_lang = await self._get_user_language(update=update)
+                if template is not None:
+                    return await call_handler(
+                        update,
+                        context,
+                        await self._get_translated_template(
+                            user_lang, template, protected, fields, result, source_lang
+                        ),
+                    )
+                message = str(result)
+                if stream:
+                    return await call_handler(
+                        update,
+                        context,
+                        stream_translation(
+                            message,
+                            lambda chunk: self._get_translated_message(
+                                user_lang=user_lang, message=chunk, source_lang=source_lang
+                            ),
+                            max_chunk_chars=max_chunk_chars,
+                            max_concurrency=max_concurrency,
+                        ),
+                    )
                 message = await self._get_translated_message(
                     user_lang=user_lang,
                     message=message,
-                    func=func,
                     source_lang=source_lang,
                 )
-                return await self._return_handler_function(
-                    func=func, update=update, context=context, message=message
-                )
+                return await call_handler(update, context, message)
 
             return wrapper
 
@@ -1,6 +1,40 @@
+import asyncio
+import hashlib
+import mmap
 import os
 import pickle
-from typing import Protocol, Union
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, List, Protocol, Tuple, Union
+
+CACHE_KEY_VERSION = 1
+
+
+def make_cache_key(text: str, source_lang: str, target_lang: str, service_id: str = "") -> str:
+    """
+    Build a content-addressed cache key for a translation.
+
+    The key is a BLAKE2b digest of the NFC-normalized, stripped text, both languages and the translator service,
+    prefixed with `CACHE_KEY_VERSION`. Identical strings therefore share one entry wherever they are sent from,
+    and bumping the version invalidates every key written by an older scheme.
+
+    :param text: The text to be translated.
+    :param source_lang: The source language code.
+    :param target_lang: The target language code.
+    :param service_id: Identifies the translator service, so different services do not share entries.
+    :return: The cache key, e.g. "v1:3f2a...".
+    """
+    normalized = unicodedata.normalize("NFC", text).strip()
+    digest = hashlib.blake2b(
+        "\0".join((normalized, source_lang, target_lang, service_id)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f"v{CACHE_KEY_VERSION}:{digest}"
 
 
 class Cache(Protocol):
@@ -74,9 +108,771 @@ class PickleCache:
             else None
         )
 
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every key-value pair in the cache.
+        """
+        with open(self.pickle_file, "rb") as file:
+            loaded_data = pickle.load(file)
+        return [(key, value) for key, value in loaded_data.__dict__.items() if isinstance(value, str)]
+
     def __del__(self) -> None:
         """
         Clean up the cache file when the cache object is destroyed.
         """
         if os.path.exists(self.pickle_file):
             os.remove(self.pickle_file)
+
+
+class MemoryCache:
+    """
+    In-process cache implementation with LRU eviction and optional per-entry TTL.
+
+    Nothing touches disk. The cache is bounded by entry count and by the UTF-8 size of its keys and values; the
+    least recently used entries are evicted once either bound is exceeded. Expired entries are dropped when they
+    are looked up or reach the LRU end. With `stale_ttl`, expired entries are kept that much longer for
+    `retrieve_stale`, which serves them when a fresh value cannot be had.
+    """
+
+    def __init__(
+        self,
+        max_entries: Union[int, None] = 10_000,
+        max_bytes: Union[int, None] = None,
+        ttl: Union[float, None] = None,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+    ) -> None:
+        """
+        Initialize the MemoryCache.
+
+        :param max_entries: The maximum number of entries kept. If None, the count is unbounded.
+        :param max_bytes: The maximum total UTF-8 size of keys and values kept. If None, the size is unbounded.
+        :param ttl: The default number of seconds an entry lives. If None, entries never expire.
+        :param clock: The monotonic clock used for expiry.
+        :param stale_ttl: The number of seconds an expired entry is kept for `retrieve_stale`.
+        :raises ValueError: If `max_entries`, `max_bytes` or `ttl` is not positive, or `stale_ttl` is negative.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("`max_entries` must be a positive integer")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("`max_bytes` must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("`ttl` must be positive")
+        if stale_ttl < 0:
+            raise ValueError("`stale_ttl` must not be negative")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, Union[float, None], int]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def store(self, key: str, value: str, ttl: Union[float, None] = None) -> None:
+        """
+        Store the value in the cache associated with the specified key, evicting old entries if needed.
+
+        :param key: The key to associate the value with.
+        :param value: The value to store in the cache.
+        :param ttl: Seconds this entry lives, overriding the cache's default `ttl`.
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        entry_size = len(key.encode("utf-8")) + len(value.encode("utf-8"))
+        if key in self._entries:
+            self._remove(key)
+        if self.max_bytes is not None and entry_size > self.max_bytes:
+            return
+        self._entries[key] = (value, expires_at, entry_size)
+        self.size += entry_size
+        while (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+            self.max_bytes is not None and self.size > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            if self._expired(oldest):
+                self.expirations += 1
+            else:
+                self.evictions += 1
+            self._remove(oldest)
+
+    async def retrieve(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value from the cache associated with the specified key, marking it as recently used.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in the cache or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self._expired(key):
+            if self._expired(key, self.stale_ttl):
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    async def retrieve_stale(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value associated with the specified key even if it expired less than `stale_ttl` ago.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in the cache.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._expired(key, self.stale_ttl):
+            return None
+        self.stale_hits += 1
+        return entry[0]
+
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every unexpired key-value pair in the cache, least recently used first.
+        """
+        return [(key, entry[0]) for key, entry in self._entries.items() if not self._expired(key)]
+
+    def _expired(self, key: str, grace: float = 0.0) -> bool:
+        expires_at = self._entries[key][1]
+        return expires_at is not None and expires_at + grace <= self._clock()
+
+    def _remove(self, key: str) -> None:
+        self.size -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        """
+        Drop every entry. The statistics are kept.
+        """
+        self._entries.clear()
+        self.size = 0
+
+
+class AppendOnlyCache:
+    """
+    Persistent cache implementation backed by an append-only log file.
+
+    Every `store` appends one record to the log and every `retrieve` reads a single value at an offset kept in an
+    in-memory index, so neither grows with the size of the cache. Overwritten entries stay in the log until
+    `compact` rewrites it, which happens automatically once they make up `compact_threshold` of the file. Stores
+    write, fsync and compact on a thread of their own, so the event loop never waits on the disk.
+
+    Each record carries a CRC32 checksum. On startup the log is replayed to rebuild the index, and a torn or
+    corrupt tail left by a crash is truncated away. Unlike `PickleCache`, the file is kept when the cache is
+    destroyed.
+    """
+
+    _header = struct.Struct(">III")
+
+    def __init__(
+        self,
+        filename: str = "translation.log",
+        compact_threshold: Union[float, None] = 0.5,
+        fsync: bool = False,
+    ) -> None:
+        """
+        Initialize the AppendOnlyCache, recovering the index from an existing log file.
+
+        :param filename: The name of the log file. Default is "translation.log".
+        :param compact_threshold: The fraction of stale bytes in the log that triggers a compaction.
+            If None, the log is only compacted by calling `compact`.
+        :param fsync: Whether to fsync the log after every store. Off by default, which survives a process crash
+            but not a power loss.
+        :raises ValueError: If `compact_threshold` is not between 0 and 1.
+        """
+        if compact_threshold is not None and not 0 < compact_threshold < 1:
+            raise ValueError("`compact_threshold` must be between 0 and 1")
+        self.filename = filename
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._size = 0
+        self._stale = 0
+        self._lock = asyncio.Lock()
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translategram-log")
+        self._file = self._open()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _open(self) -> BinaryIO:
+        """
+        Open the log file and rebuild the index from it, truncating any unreadable tail.
+        """
+        file = open(self.filename, "a+b")
+        file.seek(0)
+        self._index = {}
+        self._size = 0
+        self._stale = 0
+        while True:
+            header = file.read(self._header.size)
+            if len(header) < self._header.size:
+                break
+            key_length, value_length, checksum = self._header.unpack(header)
+            payload = file.read(key_length + value_length)
+            if len(payload) < key_length + value_length or zlib.crc32(payload) != checksum:
+                break
+            try:
+                key = payload[:key_length].decode("utf-8")
+            except UnicodeDecodeError:
+                break
+            self._add(key, self._size + self._header.size + key_length, value_length)
+            self._size += self._header.size + key_length + value_length
+        if file.tell() != self._size:
+            file.truncate(self._size)
+        return file
+
+    def _add(self, key: str, value_offset: int, value_length: int) -> None:
+        """
+        Point the index entry for `key` at a new value, accounting for the record it replaces.
+        """
+        previous = self._index.get(key)
+        if previous is not None:
+            self._stale += self._header.size + len(key.encode("utf-8")) + previous[1]
+        self._index[key] = (value_offset, value_length)
+
+    async def store(self, key: str, value: str) -> None:
+        """
+        Store the value in the cache associated with the specified key.
+
+        :param key: The key to associate the value with.
+        :param value: The value to store in the cache.
+        """
+        key_bytes = key.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        payload = key_bytes + value_bytes
+        record = self._header.pack(len(key_bytes), len(value_bytes), zlib.crc32(payload)) + payload
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            await loop.run_in_executor(self._io, self._append, record)
+            self._add(key, self._size + self._header.size + len(key_bytes), len(value_bytes))
+            self._size += len(record)
+            if self.compact_threshold is not None and self._stale > self._size * self.compact_threshold:
+                self._swap(*await loop.run_in_executor(self._io, self._rewrite, dict(self._index)))
+
+    def _append(self, record: bytes) -> None:
+        self._file.write(record)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    async def retrieve(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value from the cache associated with the specified key.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in the cache.
+        """
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        return os.pread(self._file.fileno(), length, offset).decode("utf-8")
+
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every key-value pair in the cache.
+        """
+        return [(key, str(await self.retrieve(key))) for key in list(self._index)]
+
+    def compact(self) -> None:
+        """
+        Rewrite the log with only the live entries, replacing the old file atomically. This blocks until the log
+        is rewritten; the compactions triggered by `store` run off the event loop.
+        """
+        self._swap(*self._rewrite(dict(self._index)))
+
+    def _rewrite(self, index: Dict[str, Tuple[int, int]]) -> Tuple[BinaryIO, Dict[str, Tuple[int, int]], int]:
+        """
+        Write the live entries of `index` to a new log, move it into place and open it.
+
+        :return: The new log file, its index and its size.
+        """
+        temporary = self.filename + ".compact"
+        compacted: Dict[str, Tuple[int, int]] = {}
+        size = 0
+        with open(temporary, "wb") as file:
+            for key, (offset, length) in index.items():
+                key_bytes = key.encode("utf-8")
+                payload = key_bytes + os.pread(self._file.fileno(), length, offset)
+                file.write(self._header.pack(len(key_bytes), length, zlib.crc32(payload)) + payload)
+                compacted[key] = (size + self._header.size + len(key_bytes), length)
+                size += self._header.size + len(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.filename)
+        return open(self.filename, "a+b"), compacted, size
+
+    def _swap(self, file: BinaryIO, index: Dict[str, Tuple[int, int]], size: int) -> None:
+        previous, self._file = self._file, file
+        self._index, self._size, self._stale = index, size, 0
+        previous.close()
+
+    def close(self) -> None:
+        """
+        Wait for the writes in flight and close the log file. The data stays on disk and is recovered by the next
+        instance.
+        """
+        self._io.shutdown(wait=True)
+        self._file.close()
+
+
+class SQLiteCache:
+    """
+    Persistent cache implementation backed by an SQLite database in WAL mode.
+
+    Several processes can share one database file: WAL lets readers run alongside a writer, and a busy timeout
+    makes concurrent writers wait for each other instead of failing. Every query runs on a thread pool, so the
+    event loop never blocks on disk. Stores issued concurrently are grouped into a single write transaction.
+    """
+
+    def __init__(
+        self,
+        filename: str = "translation.sqlite3",
+        max_readers: int = 4,
+        busy_timeout: float = 5.0,
+        persistent: bool = True,
+    ) -> None:
+        """
+        Initialize the SQLiteCache, creating the database and its table if needed.
+
+        :param filename: The name of the database file. Default is "translation.sqlite3".
+        :param max_readers: The number of threads used for reads.
+        :param busy_timeout: Seconds a query waits for another process's lock before failing.
+        :param persistent: Whether the database is kept when the cache is closed. If False, `aclose` removes it.
+        :raises ValueError: If `max_readers` is not positive.
+        """
+        if max_readers < 1:
+            raise ValueError("`max_readers` must be a positive integer")
+        self.filename = filename
+        self.busy_timeout = busy_timeout
+        self.persistent = persistent
+        self.commits = 0
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="translategram-sqlite-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translategram-sqlite-write")
+        self._pending: Dict[str, str] = {}
+        self._writing: List[Dict[str, str]] = []
+        self._batch: Union["asyncio.Future[None]", None] = None
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the calling thread's connection, opening it on first use.
+        """
+        connection: Union[sqlite3.Connection, None] = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.filename, timeout=self.busy_timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _read(self, key: str) -> Union[str, None]:
+        row = self._connect().execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+        return None if row is None else str(row[0])
+
+    def _read_all(self) -> List[Tuple[str, str]]:
+        rows = self._connect().execute("SELECT key, value FROM translations")
+        return [(str(key), str(value)) for key, value in rows]
+
+    def _write(self, items: List[Tuple[str, str]]) -> None:
+        with self._connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", items)
+        self.commits += 1
+
+    async def store(self, key: str, value: str) -> None:
+        """
+        Store the value in the cache associated with the specified key.
+
+        :param key: The key to associate the value with.
+        :param value: The value to store in the cache.
+        """
+        await self.store_many([(key, value)])
+
+    async def store_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """
+        Store several key-value pairs, sharing one write transaction with any other store in flight.
+
+        :param items: The key-value pairs to store.
+        """
+        self._pending.update(items)
+        if self._batch is None:
+            self._batch = asyncio.ensure_future(self._commit_pending())
+        await asyncio.shield(self._batch)
+
+    async def _commit_pending(self) -> None:
+        """
+        Write every pending entry in one transaction, after giving concurrent stores a chance to join it.
+        """
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending, {}
+        self._batch = None
+        self._writing.append(batch)
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._writer, self._write, list(batch.items()))
+        finally:
+            self._writing.remove(batch)
+
+    async def retrieve(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value from the cache associated with the specified key.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in the cache.
+        """
+        value = self._pending.get(key)
+        if value is None:
+            for batch in reversed(self._writing):
+                value = batch.get(key)
+                if value is not None:
+                    break
+        if value is not None:
+            return value
+        return await asyncio.get_running_loop().run_in_executor(self._readers, self._read, key)
+
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every key-value pair in the cache, including writes not committed yet.
+        """
+        if self._batch is not None:
+            await asyncio.shield(self._batch)
+        rows = await asyncio.get_running_loop().run_in_executor(self._readers, self._read_all)
+        items = dict(rows)
+        for batch in self._writing:
+            items.update(batch)
+        items.update(self._pending)
+        return list(items.items())
+
+    async def aclose(self) -> None:
+        """
+        Wait for the pending writes, close every connection and, unless `persistent` is set, remove the database.
+        """
+        if self._batch is not None:
+            await asyncio.shield(self._batch)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._close)
+
+    def _close(self) -> None:
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        if not self.persistent:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.filename + suffix):
+                    os.remove(self.filename + suffix)
+
+
+class TieredCache:
+    """
+    Composite cache implementation layering a fast front cache over a persistent back cache.
+
+    Reads go to the front first and fall back to the back, promoting hits into the front. Writes land in the front
+    right away and are queued for the back, which a background task flushes every `flush_interval` seconds or as
+    soon as `batch_size` writes are pending. Disk latency therefore stays off the reply path while translations
+    still survive restarts. If the back cache has a `store_many(items)` coroutine, each batch is written with it.
+
+    Call `aclose` on shutdown to flush what is still pending and close both caches.
+    """
+
+    def __init__(
+        self,
+        front: Cache,
+        back: Cache,
+        flush_interval: float = 1.0,
+        batch_size: int = 100,
+        flush_on_close: bool = True,
+    ) -> None:
+        """
+        Initialize the TieredCache.
+
+        :param front: The fast cache, e.g. a `MemoryCache`.
+        :param back: The persistent cache, e.g. an `AppendOnlyCache`.
+        :param flush_interval: The maximum number of seconds a write waits before being flushed to the back.
+        :param batch_size: The number of pending writes that triggers an early flush.
+        :param flush_on_close: Whether `aclose` flushes pending writes. If False, they are dropped.
+        :raises ValueError: If `flush_interval` or `batch_size` is not positive.
+        """
+        if flush_interval <= 0:
+            raise ValueError("`flush_interval` must be positive")
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be a positive integer")
+        self.front = front
+        self.back = back
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.flush_on_close = flush_on_close
+        self._pending: Dict[str, str] = {}
+        self._flusher: Union["asyncio.Task[None]", None] = None
+        self._wakeup: Union[asyncio.Event, None] = None
+        self.flush_errors = 0
+
+    async def store(self, key: str, value: str) -> None:
+        """
+        Store the value in the front cache and queue it for the back cache.
+
+        :param key: The key to associate the value with.
+        :param value: The value to store in the cache.
+        """
+        await self.front.store(key, value)
+        self._pending[key] = value
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.ensure_future(self._flush_periodically())
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def retrieve(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value from the front cache, falling back to pending writes and then to the back cache.
+
+        A value that expired in the front but is still kept there (see `retrieve_stale`) is a miss: it is not
+        revived from the back, so `stale_while_revalidate` refreshes it. The back keeps no timestamps, so a value
+        found only there, e.g. after a restart, counts as fresh.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in either cache or expired
+            in the front.
+        """
+        value = await self.front.retrieve(key)
+        if value is not None:
+            return value
+        retrieve_stale = getattr(self.front, "retrieve_stale", None)
+        if retrieve_stale is not None and await retrieve_stale(key) is not None:
+            return None
+        value = self._pending.get(key)
+        if value is None:
+            value = await self.back.retrieve(key)
+        if value is not None:
+            await self.front.store(key, value)
+        return value
+
+    async def retrieve_stale(self, key: str) -> Union[str, None]:
+        """
+        Retrieve an expired value the front cache still keeps, if it supports `retrieve_stale`.
+
+        :param key: The key to retrieve the value for.
+        :return: The stale value, or None if there is none.
+        """
+        retrieve_stale = getattr(self.front, "retrieve_stale", None)
+        return await retrieve_stale(key) if retrieve_stale is not None else None
+
+    async def flush(self) -> None:
+        """
+        Write every pending entry to the back cache. Entries that fail to be written stay pending.
+        """
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        try:
+            store_many = getattr(self.back, "store_many", None)
+            if store_many is not None:
+                await store_many(list(batch.items()))
+            else:
+                for key, value in list(batch.items()):
+                    await self.back.store(key, value)
+                    del batch[key]
+        except BaseException:
+            self._pending = {**batch, **self._pending}
+            raise
+
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every key-value pair in the back cache, with pending writes applied. Requires `items` on the back.
+        """
+        items = dict(await self.back.items())  # type: ignore[attr-defined]
+        items.update(self._pending)
+        return list(items.items())
+
+    async def _flush_periodically(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                self.flush_errors += 1
+
+    async def aclose(self) -> None:
+        """
+        Stop the background flusher and, if `flush_on_close` is set, flush the pending writes. Then close both
+        caches with their `aclose` or `close`, if they have one.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        try:
+            if self.flush_on_close:
+                await self.flush()
+            else:
+                self._pending = {}
+        finally:
+            for cache in (self.front, self.back):
+                aclose = getattr(cache, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+                else:
+                    close = getattr(cache, "close", None)
+                    if close is not None:
+                        close()
+
+
+BUNDLE_MAGIC = b"TGCB"
+BUNDLE_VERSION = 1
+_bundle_header = struct.Struct(">4sHI")
+_bundle_entry = struct.Struct(">QIQI")
+
+
+def write_bundle(filename: str, items: Iterable[Tuple[str, str]]) -> int:
+    """
+    Write translations to a bundle file that `BundleCache` can serve without parsing it.
+
+    The file holds a header (magic, `BUNDLE_VERSION`, entry count), then a fixed-size index entry per key sorted
+    by the UTF-8 bytes of the key, then the keys and values themselves. It is written to a temporary file first and
+    moved into place, so readers never see a partial bundle.
+
+    :param filename: The name of the bundle file.
+    :param items: The key-value pairs to write. A repeated key keeps its last value.
+    :return: The number of entries written.
+    """
+    entries = sorted({key.encode("utf-8"): value.encode("utf-8") for key, value in items}.items())
+    offset = _bundle_header.size + _bundle_entry.size * len(entries)
+    index = []
+    for key, value in entries:
+        index.append(_bundle_entry.pack(offset, len(key), offset + len(key), len(value)))
+        offset += len(key) + len(value)
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(_bundle_header.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(entries)))
+        file.write(b"".join(index))
+        for key, value in entries:
+            file.write(key)
+            file.write(value)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, filename)
+    return len(entries)
+
+
+class BundleCache:
+    """
+    Cache implementation serving a precompiled bundle written by `write_bundle`.
+
+    The bundle is memory-mapped and looked up by binary search over its sorted index, so loading it costs nothing
+    however many translations it holds, and pages are shared between processes on the same host. The bundle is
+    read-only: translations stored at runtime go to an `overlay` cache, which is also consulted first on lookups.
+    """
+
+    def __init__(self, filename: str, overlay: Union[Cache, None] = None) -> None:
+        """
+        Initialize the BundleCache by mapping the bundle file.
+
+        :param filename: The name of the bundle file.
+        :param overlay: The cache receiving runtime stores. Defaults to a `MemoryCache` with its default bounds, so
+            an overlay that keeps every runtime translation must be passed explicitly.
+        :raises ValueError: If the file is not a bundle or was written by an unsupported version.
+        """
+        self.filename = filename
+        self.overlay: Cache = overlay if overlay is not None else MemoryCache()
+        with open(filename, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._map: Union[mmap.mmap, bytes] = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        if len(self._map) < _bundle_header.size:
+            raise ValueError(f"{filename!r} is not a translation bundle")
+        magic, version, self._count = _bundle_header.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{filename!r} is not a translation bundle")
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported translation bundle version {version}")
+
+    def __len__(self) -> int:
+        return int(self._count)
+
+    def _entry(self, position: int) -> Tuple[int, ...]:
+        return _bundle_entry.unpack_from(self._map, _bundle_header.size + position * _bundle_entry.size)
+
+    def _key(self, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._entry(position)
+        return self._map[key_offset:key_offset + key_length]
+
+    def _value(self, position: int) -> str:
+        _, _, value_offset, value_length = self._entry(position)
+        return self._map[value_offset:value_offset + value_length].decode("utf-8")
+
+    async def store(self, key: str, value: str) -> None:
+        """
+        Store the value in the overlay cache.
+
+        :param key: The key to associate the value with.
+        :param value: The value to store in the cache.
+        """
+        await self.overlay.store(key, value)
+
+    async def retrieve(self, key: str) -> Union[str, None]:
+        """
+        Retrieve the value from the overlay cache, or else from the bundle.
+
+        :param key: The key to retrieve the value for.
+        :return: The value associated with the key, or None if the key does not exist in the cache.
+        """
+        value = await self.overlay.retrieve(key)
+        if value is not None:
+            return value
+        target = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(low) == target:
+            return self._value(low)
+        return None
+
+    async def items(self) -> List[Tuple[str, str]]:
+        """
+        Return every key-value pair in the bundle, with the overlay's entries applied if it has `items`.
+        """
+        items = {self._key(i).decode("utf-8"): self._value(i) for i in range(self._count)}
+        overlay_items = getattr(self.overlay, "items", None)
+        if overlay_items is not None:
+            items.update(await overlay_items())
+        return list(items.items())
+
+    def close(self) -> None:
+        """
+        Unmap the bundle file.
+        """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
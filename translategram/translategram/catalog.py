@@ -0,0 +1,349 @@
+"""
+Translate a catalog of source strings into several languages ahead of time, straight into a cache or a bundle.
+
+    python -m translategram.translategram.catalog messages.po -l es fr de --source-lang en --cache catalog.sqlite3
+
+Translations are stored chunk by chunk as they arrive and strings already in the cache are skipped, so an
+interrupted run picks up where it stopped when started again with the same cache.
+"""
+import argparse
+import ast
+import asyncio
+import csv
+import functools
+import json
+import multiprocessing.util
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+from translategram.translategram.cache import (
+    AppendOnlyCache,
+    Cache,
+    MemoryCache,
+    SQLiteCache,
+    make_cache_key,
+    write_bundle,
+)
+from translategram.translategram.languages import same_language
+from translategram.translategram.translator_services import (
+    HttpTranslatorService,
+    MtranslateTranslatorService,
+    translate_batch,
+)
+
+_csv_columns = ("source", "text", "msgid")
+
+
+class CatalogReport(NamedTuple):
+    """
+    The outcome of `translate_catalog`.
+    """
+
+    translated: int
+    cached: int
+    failed: int
+    elapsed: float
+
+
+def _load_json(filename: str) -> List[str]:
+    with open(filename, encoding="utf-8") as file:
+        data = json.load(file)
+    values = list(data.values()) if isinstance(data, dict) else data
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError("A JSON catalog must be a list of strings or an object mapping ids to strings")
+    return values
+
+
+def _load_csv(filename: str) -> List[str]:
+    with open(filename, encoding="utf-8", newline="") as file:
+        rows = [row for row in csv.reader(file) if row]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    for column in _csv_columns:
+        if column in header:
+            index = header.index(column)
+            return [row[index] for row in rows[1:] if len(row) > index]
+    return [row[0] for row in rows]
+
+
+def _load_po(filename: str) -> List[str]:
+    texts: List[str] = []
+    current: Union[List[str], None] = None
+    with open(filename, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith(("msgid ", "msgid_plural ")):
+                current = [ast.literal_eval(line.split(" ", 1)[1])]
+                texts.append("")
+            elif line.startswith('"') and current is not None:
+                current.append(ast.literal_eval(line))
+            else:
+                current = None
+            if current is not None:
+                texts[-1] = "".join(current)
+    return texts
+
+
+_loaders: Dict[str, Callable[[str], List[str]]] = {"json": _load_json, "csv": _load_csv, "po": _load_po}
+
+
+def load_catalog(filename: str, catalog_format: Union[str, None] = None) -> List[str]:
+    """
+    Read the source strings of a catalog, without blanks and duplicates.
+
+    JSON catalogs hold a list of strings or an object mapping ids to strings. CSV catalogs use their "source",
+    "text" or "msgid" column if the first row names one, or else their first column. PO catalogs contribute their
+    `msgid` and `msgid_plural` strings; the header entry is skipped.
+
+    :param filename: The name of the catalog file.
+    :param catalog_format: "json", "csv" or "po". If None, it is taken from the file extension.
+    :return: The source strings, in catalog order.
+    :raises ValueError: If the format is unknown or the file does not hold a catalog.
+    """
+    catalog_format = catalog_format or filename.rsplit(".", 1)[-1].lower()
+    if catalog_format not in _loaders:
+        raise ValueError(f"Unknown catalog format {catalog_format!r}, expected one of {', '.join(_loaders)}")
+    return list(dict.fromkeys(text for text in _loaders[catalog_format](filename) if text.strip()))
+
+
+_worker_service: Any = None
+_worker_loop: Union[asyncio.AbstractEventLoop, None] = None
+
+
+def _service_id(service: Any) -> str:
+    return str(getattr(service, "service_id", type(service).__name__))
+
+
+def _init_worker(service_factory: Callable[[], Any]) -> None:
+    """
+    Create the service and the event loop a worker process translates every chunk with, so its connections and
+    threads are reused across chunks, and close them when the worker exits.
+    """
+    global _worker_service, _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    _worker_service = service_factory()
+    multiprocessing.util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    assert _worker_loop is not None
+    aclose = getattr(_worker_service, "aclose", None)
+    if aclose is not None:
+        _worker_loop.run_until_complete(aclose())
+    _worker_loop.close()
+
+
+def _worker_service_id() -> str:
+    return _service_id(_worker_service)
+
+
+def _translate_chunk_in_process(
+    texts: Sequence[str], target_language: str, source_language: str
+) -> List[Union[str, None]]:
+    """
+    Translate one chunk in a worker process, with the service of the worker.
+    """
+    assert _worker_loop is not None
+    results = _worker_loop.run_until_complete(
+        translate_batch(_worker_service, texts, target_language, source_language, return_exceptions=True)
+    )
+    return [result if isinstance(result, str) else None for result in results]
+
+
+async def translate_catalog(
+    texts: Sequence[str],
+    languages: Sequence[str],
+    service_factory: Callable[[], Any],
+    cache: Cache,
+    source_language: str = "auto",
+    concurrency: int = 4,
+    chunk_size: int = 50,
+    processes: int = 0,
+    progress: Union[Callable[[int, int], object], None] = None,
+) -> CatalogReport:
+    """
+    Translate every text into every language and store the translations in `cache`, under the keys
+    `PythonTelegramBotAdapter` looks up (see `make_cache_key`).
+
+    Texts already cached for a language are skipped, as are languages that are the same as `source_language`.
+    The rest is split into chunks of `chunk_size` texts of one language, translated `concurrency` chunks at a time
+    with `translate_batch`, and stored as soon as each chunk is done. Failed translations are counted and left out,
+    so running again retries them.
+
+    :param texts: The source strings.
+    :param languages: The language codes to translate into.
+    :param service_factory: A zero-argument factory for the translator service, e.g. `MtranslateTranslatorService`.
+        With `processes`, it must be picklable, like a class or a `functools.partial` of one, and it is only
+        called in the worker processes, once each.
+    :param cache: The cache receiving the translations. `store_many` is used when it has one.
+    :param source_language: The language of the source strings.
+    :param concurrency: The maximum number of chunks in flight, raised to `processes` if lower.
+    :param chunk_size: The maximum number of texts in a chunk.
+    :param processes: The number of worker processes the chunks are sharded across, each translating every chunk
+        it gets with a service and an event loop of its own. If 0, chunks are translated in this process with one
+        shared service.
+    :param progress: Called with `(done, total)` after each chunk, counting texts per language.
+    :return: How many translations were made, already cached or failed, and how long it took.
+    :raises ValueError: If `concurrency` or `chunk_size` is not positive, or `processes` is negative.
+    """
+    if concurrency < 1 or chunk_size < 1 or processes < 0:
+        raise ValueError("`concurrency` and `chunk_size` must be positive integers and `processes` not negative")
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    executor = (
+        ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(service_factory,))
+        if processes
+        else None
+    )
+    service = service_factory() if executor is None else None
+    counts = {"translated": 0, "cached": 0, "failed": 0}
+    try:
+        service_id = (
+            _service_id(service) if executor is None else await loop.run_in_executor(executor, _worker_service_id)
+        )
+        languages = [language for language in languages if not same_language(source_language, language)]
+        total = len(texts) * len(languages)
+        chunks: "asyncio.Queue[Tuple[str, List[str]]]" = asyncio.Queue()
+        for language in languages:
+            missing = []
+            for text in texts:
+                if await cache.retrieve(make_cache_key(text, source_language, language, service_id)):
+                    counts["cached"] += 1
+                else:
+                    missing.append(text)
+            for i in range(0, len(missing), chunk_size):
+                chunks.put_nowait((language, missing[i:i + chunk_size]))
+        store_many = getattr(cache, "store_many", None)
+
+        async def translate(language: str, chunk: List[str]) -> List[Union[str, None]]:
+            if executor is not None:
+                return await loop.run_in_executor(
+                    executor, _translate_chunk_in_process, chunk, language, source_language
+                )
+            results = await translate_batch(service, chunk, language, source_language, return_exceptions=True)
+            return [result if isinstance(result, str) else None for result in results]
+
+        async def worker() -> None:
+            while not chunks.empty():
+                language, chunk = chunks.get_nowait()
+                items = [
+                    (make_cache_key(text, source_language, language, service_id), translated)
+                    for text, translated in zip(chunk, await translate(language, chunk))
+                    if translated
+                ]
+                if store_many is not None:
+                    await store_many(items)
+                else:
+                    for key, value in items:
+                        await cache.store(key, value)
+                counts["translated"] += len(items)
+                counts["failed"] += len(chunk) - len(items)
+                if progress is not None:
+                    progress(sum(counts.values()), total)
+
+        if progress is not None:
+            progress(counts["cached"], total)
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, processes))))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        aclose = getattr(service, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return CatalogReport(elapsed=time.perf_counter() - start, **counts)
+
+
+def _service_factory(args: argparse.Namespace) -> Callable[[], Any]:
+    if args.service == "http":
+        return functools.partial(HttpTranslatorService, base_url=args.base_url)
+    return functools.partial(MtranslateTranslatorService, max_workers=args.max_workers)
+
+
+def _open_cache(args: argparse.Namespace) -> Cache:
+    if args.cache is None:
+        return MemoryCache(max_entries=None)
+    if args.cache_type == "append-only":
+        return AppendOnlyCache(filename=args.cache)
+    return SQLiteCache(filename=args.cache)
+
+
+class _ProgressPrinter:
+    """
+    Prints how far the run got and its throughput on one refreshed line.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.first: Union[int, None] = None
+
+    def __call__(self, done: int, total: int) -> None:
+        if self.first is None:
+            self.first = done
+        elapsed = time.perf_counter() - self.start
+        rate = (done - self.first) / elapsed if elapsed else 0.0
+        print(f"\r{done}/{total} translations, {rate:.1f}/s", end="", file=sys.stderr, flush=True)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    texts = load_catalog(args.catalog, args.format)
+    cache = _open_cache(args)
+    try:
+        report = await translate_catalog(
+            texts,
+            args.languages,
+            _service_factory(args),
+            cache,
+            source_language=args.source_lang,
+            concurrency=args.concurrency,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+            progress=_ProgressPrinter(),
+        )
+        if args.bundle:
+            items = getattr(cache, "items")
+            written = write_bundle(args.bundle, await items())
+            print(f"\nWrote {written} translations to {args.bundle}", end="", file=sys.stderr)
+    finally:
+        for close in (getattr(cache, "aclose", None), getattr(cache, "close", None)):
+            if close is not None:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+                break
+    rate = report.translated / report.elapsed if report.elapsed else 0.0
+    print(
+        f"\n{report.translated} translated, {report.cached} already cached, {report.failed} failed "
+        f"in {report.elapsed:.1f}s ({rate:.1f} translations/s)",
+        file=sys.stderr,
+    )
+    return 1 if report.failed else 0
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("catalog", help="JSON, CSV or PO file of source strings")
+    parser.add_argument("-l", "--languages", nargs="+", required=True, help="language codes to translate into")
+    parser.add_argument("--format", choices=sorted(_loaders), help="catalog format, by default its extension")
+    parser.add_argument("--source-lang", default="auto")
+    parser.add_argument("--service", choices=["mtranslate", "http"], default="mtranslate")
+    parser.add_argument("--base-url", default="https://translate.google.com", help="endpoint of the http service")
+    parser.add_argument("--max-workers", type=int, default=8, help="threads of the mtranslate service")
+    parser.add_argument(
+        "--cache", help="cache file receiving the translations; running again resumes from it (or use --bundle)"
+    )
+    parser.add_argument("--cache-type", choices=["sqlite", "append-only"], default="sqlite")
+    parser.add_argument("--bundle", help="write every translation to this bundle file")
+    parser.add_argument("--concurrency", type=int, default=4, help="chunks translated at once")
+    parser.add_argument("--chunk-size", type=int, default=50, help="strings per chunk")
+    parser.add_argument("--processes", type=int, default=0, help="worker processes to shard chunks across")
+    args = parser.parse_args(argv)
+    if args.cache is None and args.bundle is None:
+        parser.error("at least one of --cache and --bundle is required, or the translations are discarded")
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
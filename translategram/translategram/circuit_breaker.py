@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, TypeVar, Union
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreakerOpen(Exception):
+    """
+    Raised instead of making a call while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for a while, so callers fail fast instead of waiting on it.
+
+    The breaker starts closed. After `failure_threshold` consecutive failed or slow calls it opens and rejects
+    every call with `CircuitBreakerOpen`. Once `reset_timeout` seconds have passed it turns half-open and lets
+    `half_open_max_calls` trial calls through: a success closes it again, a failure opens it for another
+    `reset_timeout`. A call only counts in the state it started in: the outcome of a call still in flight when the
+    state changed is ignored. Every state change is passed to the listeners as `(old_state, new_state)`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        slow_call_threshold: Union[float, None] = None,
+        call_timeout: Union[float, None] = None,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the `CircuitBreaker` instance in the closed state.
+
+        :param failure_threshold: The number of consecutive failed or slow calls that opens the breaker.
+        :param reset_timeout: Seconds the breaker stays open before trial calls are let through.
+        :param slow_call_threshold: Seconds after which a successful call still counts as a failure.
+            If None, only errors count.
+        :param call_timeout: Seconds after which a call is cancelled and counted as a failure. If None, calls are
+            not timed out.
+        :param half_open_max_calls: The number of trial calls allowed at once while half-open.
+        :param clock: The monotonic clock used for timing.
+        :raises ValueError: If `failure_threshold` or `half_open_max_calls` is not positive.
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("`failure_threshold` and `half_open_max_calls` must be positive integers")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.call_timeout = call_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._generation = 0
+        self._listeners: List[Callable[[str, str], object]] = []
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """
+        The current state: "closed", "open" or "half_open".
+        """
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def add_listener(self, listener: Callable[[str, str], object]) -> None:
+        """
+        Register a callable receiving `(old_state, new_state)` on every state change.
+
+        :param listener: The callable to register.
+        """
+        self._listeners.append(listener)
+
+    def _transition(self, state: str) -> None:
+        old_state = self._state
+        if old_state == state:
+            return
+        self._state = state
+        self._generation += 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state != HALF_OPEN:
+            self._trial_calls = 0
+        if state == CLOSED:
+            self._failures = 0
+        for listener in self._listeners:
+            listener(old_state, state)
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._transition(OPEN)
+
+    def _record_success(self) -> None:
+        if self._state == HALF_OPEN:
+            self._transition(CLOSED)
+        self._failures = 0
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make the call unless the breaker is open, recording its outcome.
+
+        :param func: A zero-argument coroutine function performing the call.
+        :return: The result of the call.
+        :raises CircuitBreakerOpen: If the breaker is open, or half-open with all trial calls in flight.
+        :raises asyncio.TimeoutError: If the call does not finish within `call_timeout` seconds.
+        """
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._trial_calls >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitBreakerOpen(f"Circuit breaker is {state}")
+        if state == HALF_OPEN:
+            self._trial_calls += 1
+        generation = self._generation
+        started_at = self._clock()
+        try:
+            result = await asyncio.wait_for(func(), timeout=self.call_timeout)
+        except Exception:
+            if self._generation == generation:
+                self._record_failure()
+            raise
+        finally:
+            if state == HALF_OPEN and self._generation == generation:
+                self._trial_calls -= 1
+        if self._generation != generation:
+            return result
+        if self.slow_call_threshold is not None and self._clock() - started_at > self.slow_call_threshold:
+            self._record_failure()
+        else:
+            self._record_success()
+        return result
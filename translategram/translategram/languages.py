@@ -0,0 +1,252 @@
+import re
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Union
+
+from translategram.translategram.cache import Cache
+
+DEFAULT_ALIASES: Mapping[str, str] = {
+    "zh": "zh-CN",
+    "zh-cn": "zh-CN",
+    "zh-sg": "zh-CN",
+    "zh-hans": "zh-CN",
+    "zh-tw": "zh-TW",
+    "zh-hk": "zh-TW",
+    "zh-hant": "zh-TW",
+    "he": "iw",
+    "jv": "jw",
+    "nb": "no",
+    "nn": "no",
+}
+
+
+def normalize_language(language_code: str) -> str:
+    """
+    Normalize a language code for lookups: trimmed, lowercase, with `-` between subtags (`pt_BR` -> `pt-br`).
+
+    :param language_code: The language code to normalize.
+    :return: The normalized language code.
+    """
+    return language_code.strip().replace("_", "-").lower()
+
+
+@lru_cache(maxsize=1024)
+def same_language(first: str, second: str) -> bool:
+    """
+    Tell whether two language codes name the same language, ignoring case, region and aliases
+    (`en-US` and `en`, `he` and `iw`, but not `zh-CN` and `zh-TW`). `auto` is never the same as anything.
+    Results are cached.
+
+    :param first: A language code.
+    :param second: Another language code.
+    :return: Whether both codes name the same language.
+    """
+    first, second = _canonical_language(first), _canonical_language(second)
+    return first == second and first != "auto"
+
+
+def _canonical_language(language_code: str) -> str:
+    code = normalize_language(language_code)
+    base = code.split("-")[0]
+    return normalize_language(DEFAULT_ALIASES.get(code) or DEFAULT_ALIASES.get(base) or base)
+
+
+_script_languages = {
+    "HANGUL": "ko",
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "THAI": "th",
+    "GREEK": "el",
+    "HEBREW": "iw",
+    "GEORGIAN": "ka",
+    "ARMENIAN": "hy",
+    "DEVANAGARI": "hi",
+    "BENGALI": "bn",
+    "TAMIL": "ta",
+    "GUJARATI": "gu",
+    "KHMER": "km",
+    "LAO": "lo",
+}
+_stopwords = {
+    "en": {"the", "and", "is", "are", "you", "to", "of", "with", "your", "this", "for", "it", "be", "can", "in"},
+    "es": {"el", "la", "los", "las", "y", "es", "que", "de", "para", "con", "tu", "su", "por", "un", "una"},
+    "fr": {"le", "la", "les", "et", "est", "vous", "de", "pour", "avec", "votre", "des", "un", "une", "ce", "pas"},
+    "de": {"der", "die", "das", "und", "ist", "sie", "du", "mit", "für", "zu", "nicht", "ein", "eine", "ich", "dein"},
+    "pt": {"o", "os", "as", "e", "é", "que", "de", "para", "com", "você", "seu", "sua", "um", "uma", "não"},
+    "it": {"il", "lo", "gli", "e", "è", "che", "di", "per", "con", "tu", "tuo", "un", "una", "non", "sono"},
+    "ru": {"и", "в", "не", "на", "что", "я", "с", "это", "вы", "как", "для", "по", "ваш", "он", "мы"},
+    "uk": {"і", "в", "не", "на", "що", "я", "з", "це", "ви", "як", "для", "по", "ваш", "та", "ми"},
+}
+_word_expr = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4096)
+def detect_language(text: str) -> Union[str, None]:
+    """
+    Guess the language of a text with cheap local heuristics, returning a guess only when it is a confident one.
+
+    Scripts used by a single language (Hangul, Kana, Thai, Greek, ...) decide on their own, as do letters only
+    Russian or Ukrainian use. Otherwise, for Latin and Cyrillic text, the most frequent function words of a few
+    common languages are counted. Results are cached per text.
+
+    :param text: The text to inspect.
+    :return: The language code, or None if the language could not be told with confidence.
+    """
+    scripts: Dict[str, int] = {}
+    for char in text:
+        if char.isalpha():
+            script = unicodedata.name(char, "UNKNOWN").split(" ")[0]
+            scripts[script] = scripts.get(script, 0) + 1
+    if not scripts:
+        return None
+    script = max(scripts, key=lambda name: scripts[name])
+    if script in ("CJK", "HIRAGANA", "KATAKANA") and ("HIRAGANA" in scripts or "KATAKANA" in scripts):
+        return "ja"
+    if script in _script_languages:
+        return _script_languages[script]
+    if script not in ("LATIN", "CYRILLIC"):
+        return None
+    if script == "CYRILLIC":
+        letters = set(text.lower())
+        if letters & set("іїєґ"):
+            return "uk"
+        if letters & set("ыэъё"):
+            return "ru"
+    words = _word_expr.findall(text.lower())
+    scores = sorted(
+        ((sum(word in stopwords for word in words), language) for language, stopwords in _stopwords.items()),
+        reverse=True,
+    )
+    (best, language), (second, _) = scores[0], scores[1]
+    if best >= 2 and best >= 2 * second:
+        return language
+    return None
+
+
+class LanguageResolver:
+    """
+    Resolves the language to translate into for a user.
+
+    A language a user picked with `set_override` wins. Otherwise the client's language code is normalized, mapped
+    through the alias table, and reduced to its primary subtag unless the full code is supported (`pt-br` -> `pt`),
+    so near-duplicate codes share translations. Codes that are not supported resolve to `default`.
+
+    Overrides are kept in an optional persistent `Cache` with an LRU in front of it, and resolved codes are
+    memoized, so resolving costs a dictionary lookup once warm.
+    """
+
+    def __init__(
+        self,
+        overrides: Union[Cache, None] = None,
+        aliases: Mapping[str, str] = DEFAULT_ALIASES,
+        supported: Union[Iterable[str], None] = None,
+        default: str = "en",
+        max_users: int = 10_000,
+    ) -> None:
+        """
+        Initialize the `LanguageResolver` instance.
+
+        :param overrides: The cache persisting the languages users picked. If None, overrides last until restart
+            (and only while their users stay in the LRU).
+        :param aliases: Maps normalized language codes to the code to translate into.
+        :param supported: The language codes the translator service accepts. If None, every code is accepted.
+        :param default: The language used when a user has no language code or an unsupported one.
+        :param max_users: The maximum number of users whose override lookup is kept in memory.
+        :raises ValueError: If `max_users` is not positive.
+        """
+        if max_users < 1:
+            raise ValueError("`max_users` must be a positive integer")
+        self.overrides = overrides
+        self.aliases = {normalize_language(code): target for code, target in aliases.items()}
+        self.supported = None if supported is None else {normalize_language(code) for code in supported}
+        self.default = default
+        self.max_users = max_users
+        self._users: "OrderedDict[int, Union[str, None]]" = OrderedDict()
+        self._resolved: Dict[Union[str, None], str] = {}
+
+    def resolve_code(self, language_code: Union[str, None]) -> str:
+        """
+        Resolve a client language code, ignoring overrides.
+
+        :param language_code: The language code sent by the client, e.g. `pt-br`.
+        :return: The language code to translate into.
+        """
+        resolved = self._resolved.get(language_code)
+        if resolved is None:
+            resolved = self._resolve_code(language_code)
+            self._resolved[language_code] = resolved
+        return resolved
+
+    def _resolve_code(self, language_code: Union[str, None]) -> str:
+        if not language_code:
+            return self.default
+        code = normalize_language(language_code)
+        if code in self.aliases:
+            return self.aliases[code]
+        if self.supported is not None and code in self.supported:
+            return code
+        base = code.split("-")[0]
+        if base in self.aliases:
+            return self.aliases[base]
+        if self.supported is None or base in self.supported:
+            return base
+        return self.default
+
+    async def _get_override(self, user_id: int) -> Union[str, None]:
+        if user_id in self._users:
+            self._users.move_to_end(user_id)
+            return self._users[user_id]
+        override = None
+        if self.overrides is not None:
+            override = await self.overrides.retrieve(self._key(user_id)) or None
+        self._remember(user_id, override)
+        return override
+
+    def _remember(self, user_id: int, override: Union[str, None]) -> None:
+        self._users[user_id] = override
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"language:{user_id}"
+
+    async def resolve(self, user_id: Union[int, None], language_code: Union[str, None]) -> str:
+        """
+        Resolve the language to translate into for a user.
+
+        :param user_id: The Telegram user id, or None if the update has no user.
+        :param language_code: The language code sent by the user's client.
+        :return: The language code to translate into.
+        """
+        if user_id is not None:
+            override = await self._get_override(user_id)
+            if override is not None:
+                return override
+        return self.resolve_code(language_code)
+
+    async def set_override(self, user_id: int, language_code: str) -> str:
+        """
+        Make a user's translations use the given language from now on.
+
+        :param user_id: The Telegram user id.
+        :param language_code: The language the user picked. It is resolved like a client language code.
+        :return: The resolved language code that was stored.
+        """
+        resolved = self.resolve_code(language_code)
+        if self.overrides is not None:
+            await self.overrides.store(self._key(user_id), resolved)
+        self._remember(user_id, resolved)
+        return resolved
+
+    async def clear_override(self, user_id: int) -> None:
+        """
+        Make a user's translations follow their client language again.
+
+        :param user_id: The Telegram user id.
+        """
+        if self.overrides is not None:
+            await self.overrides.store(self._key(user_id), "")
+        self._remember(user_id, None)
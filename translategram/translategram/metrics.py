@@ -0,0 +1,214 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from types import TracebackType
+from typing import Callable, ContextManager, Dict, List, Protocol, Sequence, Tuple, Type, Union
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics(Protocol):
+    """
+    Protocol for recording what the translation pipeline does.
+
+    The adapter times each stage of an update with `stage`: "resolve_language", "cache_retrieve", "translate"
+    (one upstream call), "cache_store" and "handler". It counts events per language with `increment`:
+    "cache_hits", "cache_misses", "stale_hits", "negative_hits" (messages sent untranslated because they or their
+    language were rejected before) and "skipped_translations". `stage` is also the tracing hook: an implementation
+    may open a span there.
+    """
+
+    def stage(self, name: str) -> ContextManager[object]:
+        """
+        Time a stage of the pipeline. An exception leaving the context marks the stage as failed.
+
+        :param name: The name of the stage.
+        :return: A context manager wrapping the stage.
+        """
+        ...
+
+    def increment(self, name: str, language: str = "") -> None:
+        """
+        Count an event.
+
+        :param name: The name of the event.
+        :param language: The language the event happened for, if any.
+        """
+        ...
+
+
+class NoOpMetrics:
+    """
+    Metrics that record nothing, the default.
+    """
+
+    _context = nullcontext()
+
+    def stage(self, name: str) -> ContextManager[object]:
+        return self._context
+
+    def increment(self, name: str, language: str = "") -> None:
+        pass
+
+
+class _Stage:
+    """
+    Times one stage for `PrometheusMetrics`, keeping its in-flight count.
+    """
+
+    def __init__(self, metrics: "PrometheusMetrics", name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._started_at = 0.0
+
+    def __enter__(self) -> None:
+        self._metrics._in_flight[self._name] = self._metrics._in_flight.get(self._name, 0) + 1
+        self._started_at = self._metrics._clock()
+
+    def __exit__(
+        self,
+        exc_type: Union[Type[BaseException], None],
+        exc: Union[BaseException, None],
+        traceback: Union[TracebackType, None],
+    ) -> None:
+        self._metrics._in_flight[self._name] -= 1
+        self._metrics.observe(self._name, self._metrics._clock() - self._started_at, failed=exc_type is not None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items() if value)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class PrometheusMetrics:
+    """
+    Metrics kept in memory and exported in the Prometheus text format.
+
+    Each stage gets a latency histogram (`<namespace>_stage_seconds`), an error counter
+    (`<namespace>_stage_errors_total`) and an in-flight gauge (`<namespace>_stage_in_flight`). Events are counted as
+    `<namespace>_<event>_total`, labelled with their language. Serve `render()` from a `/metrics` endpoint.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "translategram",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initialize the `PrometheusMetrics` instance with no samples.
+
+        :param namespace: The prefix of every metric name.
+        :param buckets: The upper bounds, in seconds, of the latency histogram buckets.
+        :param clock: The clock used for timing stages.
+        :raises ValueError: If `buckets` is empty or not sorted.
+        """
+        if not buckets or list(buckets) != sorted(buckets):
+            raise ValueError("`buckets` must be a non-empty sorted sequence")
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._clock = clock
+        self._histograms: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def stage(self, name: str) -> ContextManager[object]:
+        return _Stage(self, name)
+
+    def observe(self, stage: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record one run of a stage.
+
+        :param stage: The name of the stage.
+        :param seconds: How long the stage took.
+        :param failed: Whether the stage raised.
+        """
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = [0] * (len(self.buckets) + 1)
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        self._sums[stage] = self._sums.get(stage, 0.0) + seconds
+        if failed:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def increment(self, name: str, language: str = "") -> None:
+        self._counters[(name, language)] = self._counters.get((name, language), 0) + 1
+
+    def count(self, name: str, language: str = "") -> int:
+        """
+        The number of times an event was counted.
+
+        :param name: The name of the event.
+        :param language: The language of the event.
+        :return: The count.
+        """
+        return self._counters.get((name, language), 0)
+
+    def hit_ratio(self, language: str) -> Union[float, None]:
+        """
+        The share of cache lookups for `language` that found a fresh translation.
+
+        :param language: The language to report on.
+        :return: The hit ratio, or None if there were no lookups.
+        """
+        hits, misses = self.count("cache_hits", language), self.count("cache_misses", language)
+        return hits / (hits + misses) if hits + misses else None
+
+    def error_rate(self, stage: str) -> Union[float, None]:
+        """
+        The share of runs of `stage` that failed, e.g. the upstream error rate for "translate".
+
+        :param stage: The name of the stage.
+        :return: The error rate, or None if the stage never ran.
+        """
+        runs = sum(self._histograms.get(stage, ()))
+        return self._errors.get(stage, 0) / runs if runs else None
+
+    def in_flight(self, stage: str) -> int:
+        """
+        The number of runs of `stage` currently in progress.
+
+        :param stage: The name of the stage.
+        :return: The in-flight count.
+        """
+        return self._in_flight.get(stage, 0)
+
+    def render(self) -> str:
+        """
+        Export every metric in the Prometheus text exposition format.
+
+        :return: The exposition text.
+        """
+        name = f"{self.namespace}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each stage of the translation pipeline.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, histogram in sorted(self._histograms.items()):
+            cumulative = 0
+            for bound, count in zip([*map(repr, self.buckets), "+Inf"], histogram):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(stage=stage, le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(stage=stage)} {self._sums[stage]!r}")
+            lines.append(f"{name}_count{_labels(stage=stage)} {cumulative}")
+        name = f"{self.namespace}_stage_errors_total"
+        lines += [f"# HELP {name} Failed runs of each stage.", f"# TYPE {name} counter"]
+        lines += [f"{name}{_labels(stage=stage)} {self._errors.get(stage, 0)}" for stage in sorted(self._histograms)]
+        name = f"{self.namespace}_stage_in_flight"
+        lines += [f"# HELP {name} Runs of each stage in progress.", f"# TYPE {name} gauge"]
+        lines += [f"{name}{_labels(stage=stage)} {count}" for stage, count in sorted(self._in_flight.items())]
+        for event in sorted({event for event, _ in self._counters}):
+            name = f"{self.namespace}_{event}_total"
+            lines += [f"# TYPE {name} counter"]
+            lines += [
+                f"{name}{_labels(language=language)} {count}"
+                for (counted, language), count in sorted(self._counters.items())
+                if counted == event
+            ]
+        return "\n".join(lines) + "\n"
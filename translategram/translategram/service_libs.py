@@ -1,4 +1,23 @@
-try:
-    import mtranslate
-except ImportError:
-    mtranslate = None
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx  # noqa: F401
+    import mtranslate  # noqa: F401
+
+_optional_modules = ("mtranslate", "httpx")
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import an optional dependency on first access, so importing translategram does not pay for the ones a process
+    never uses. A dependency that is not installed is None.
+    """
+    if name not in _optional_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    globals()[name] = module
+    return module
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single in-flight call.
+
+    The first caller for a key starts the call. Callers arriving while it is still running await the same result
+    (or exception) instead of starting their own. Once the call finishes the key is forgotten, so later callers
+    start a fresh one.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the `SingleFlight` instance with empty counters.
+        """
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of calls currently running.
+        """
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `func` unless a call for `key` is already in flight, in which case wait for that call instead.
+
+        The call runs in its own task, so cancelling one of the callers does not cancel it for the others.
+
+        :param key: The key identifying identical calls.
+        :param func: A zero-argument coroutine function performing the call.
+        :return: The result of the call.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            self.calls += 1
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(future)  # type: ignore[no-any-return]
+
+    def _forget(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        """
+        Drop the finished call for `key`, marking its exception as retrieved if every caller went away.
+        """
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()
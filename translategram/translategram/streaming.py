@@ -0,0 +1,95 @@
+import asyncio
+import re
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple
+
+_paragraph_expr = re.compile(r"(\n\s*\n\s*)")
+_sentence_expr = re.compile(r"(?<=[.!?…。！？])(\s+)")
+_word_expr = re.compile(r"(\s+)")
+
+
+def _split(text: str, max_chars: int, expressions: List["re.Pattern[str]"]) -> List[Tuple[str, str]]:
+    """
+    Split `text` on the first expression, then split pieces still longer than `max_chars` on the next ones.
+    """
+    if len(text) <= max_chars:
+        return [(text, "")]
+    if not expressions:
+        return [(text[i:i + max_chars], "") for i in range(0, len(text), max_chars)]
+    parts = expressions[0].split(text)
+    pieces: List[Tuple[str, str]] = []
+    for i in range(0, len(parts), 2):
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        if not parts[i]:
+            if pieces:
+                pieces[-1] = (pieces[-1][0], pieces[-1][1] + separator)
+            else:
+                pieces.append(("", separator))
+            continue
+        sub_pieces = _split(parts[i], max_chars, expressions[1:])
+        sub_pieces[-1] = (sub_pieces[-1][0], sub_pieces[-1][1] + separator)
+        pieces.extend(sub_pieces)
+    return pieces
+
+
+def split_text(text: str, max_chars: int = 1000) -> List[Tuple[str, str]]:
+    """
+    Split a long text into chunks of at most `max_chars` characters, at paragraph boundaries where possible,
+    then at sentence boundaries, then between words.
+
+    Sentences of the same paragraph are merged back together as long as they fit, so a chunk holds as many whole
+    sentences as the limit allows. Paragraphs of a text longer than `max_chars` always start a new chunk, which
+    keeps the first chunk small.
+
+    :param text: The text to split.
+    :param max_chars: The maximum length of a chunk.
+    :return: `(chunk, separator)` pairs. Joining every chunk followed by its separator gives back `text`.
+    :raises ValueError: If `max_chars` is not positive.
+    """
+    if max_chars < 1:
+        raise ValueError("`max_chars` must be a positive integer")
+    chunks: List[Tuple[str, str]] = []
+    for piece, separator in _split(text, max_chars, [_paragraph_expr, _sentence_expr, _word_expr]):
+        if chunks and not _paragraph_expr.fullmatch(chunks[-1][1]):
+            merged = chunks[-1][0] + chunks[-1][1] + piece
+            if len(merged) <= max_chars:
+                chunks[-1] = (merged, separator)
+                continue
+        chunks.append((piece, separator))
+    return chunks
+
+
+async def stream_translation(
+    text: str,
+    translate: Callable[[str], Awaitable[str]],
+    max_chunk_chars: int = 1000,
+    max_concurrency: int = 4,
+) -> AsyncIterator[str]:
+    """
+    Translate a long text chunk by chunk, yielding each translated chunk as soon as it and every chunk before it
+    are done.
+
+    Chunks are translated concurrently, at most `max_concurrency` at a time. The whitespace between chunks is kept
+    as is. If the consumer stops iterating early, the translations still running are cancelled.
+
+    :param text: The text to translate.
+    :param translate: Translates a single chunk, e.g. a `translate_str` bound to the target language.
+    :param max_chunk_chars: The maximum length of a chunk; see `split_text`.
+    :param max_concurrency: The maximum number of chunks translated at once.
+    :return: An async iterator over the translated chunks, each followed by its original separator.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def translate_chunk(chunk: str) -> str:
+        if not chunk.strip():
+            return chunk
+        async with semaphore:
+            return await translate(chunk)
+
+    chunks = split_text(text, max_chunk_chars)
+    tasks = [asyncio.ensure_future(translate_chunk(chunk)) for chunk, _ in chunks]
+    try:
+        for task, (_, separator) in zip(tasks, chunks):
+            yield await task + separator
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,61 @@
+import re
+from functools import lru_cache
+from string import Formatter
+from typing import List, Tuple
+
+_token_expr = re.compile(r"\{\s*(\d+)\s*\}")
+_formatter = Formatter()
+
+
+def _escape(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
+
+def protect_placeholders(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Replace the named `{placeholders}` of a `str.format` template with numbered tokens (`{0}`, `{1}`, ...), which
+    translators leave alone, so the template can be translated without its placeholders being translated too.
+
+    :param template: The template, e.g. `"Hello {name}, you have {count:,} messages"`.
+    :return: The protected text to translate and the original placeholders, in token order.
+    :raises ValueError: If the template is malformed or has positional (`{}`, `{0}`) placeholders.
+    """
+    protected: List[str] = []
+    fields: List[str] = []
+    for literal, field_name, format_spec, conversion in _formatter.parse(template):
+        protected.append(_escape(literal))
+        if field_name is None:
+            continue
+        if not field_name or field_name.split(".")[0].split("[")[0].isdigit():
+            raise ValueError(f"Template placeholders must be named, got {{{field_name}}}")
+        field = field_name + (f"!{conversion}" if conversion else "") + (f":{format_spec}" if format_spec else "")
+        protected.append(f"{{{len(fields)}}}")
+        fields.append(f"{{{field}}}")
+    return "".join(protected), tuple(fields)
+
+
+@lru_cache(maxsize=4096)
+def restore_placeholders(translated: str, fields: Tuple[str, ...]) -> str:
+    """
+    Put the original placeholders back into a translated protected text, giving a translated template.
+
+    Tokens the translator padded with spaces (`{ 0 }`) are still recognised. Results are cached.
+
+    :param translated: The translation of the text returned by `protect_placeholders`.
+    :param fields: The placeholders returned by `protect_placeholders`.
+    :return: The translated template, ready for `str.format_map`.
+    :raises ValueError: If the translator dropped, duplicated or mangled a token.
+    """
+    restored: List[str] = []
+    seen: List[int] = []
+    for literal, field_name, format_spec, conversion in _formatter.parse(_token_expr.sub(r"{\1}", translated)):
+        restored.append(_escape(literal))
+        if field_name is None:
+            continue
+        if format_spec or conversion or not field_name.isdigit() or int(field_name) >= len(fields):
+            raise ValueError(f"Unexpected placeholder in translation: {{{field_name}}}")
+        seen.append(int(field_name))
+        restored.append(fields[int(field_name)])
+    if sorted(seen) != list(range(len(fields))):
+        raise ValueError("The translation does not keep every placeholder exactly once")
+    return "".join(restored)
@@ -1,5 +1,13 @@
-from typing import Protocol
-from translategram.translategram.service_libs import mtranslate
+import asyncio
+import html
+import random
+import re
+import sys
+import urllib.error
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Protocol, Sequence, Set, Tuple, Union
+from translategram.translategram import service_libs
 
 
 class TranslatorService(Protocol):
@@ -20,20 +28,137 @@ class TranslatorService(Protocol):
         """
         ...
 
+    async def translate_batch(
+        self,
+        texts: Sequence[str],
+        target_language: str,
+        source_language: str = "auto",
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Translate several strings to the target language, keeping their order.
+
+        The default implementation makes one concurrent `translate_str` call per string. Services that can pack
+        several strings into one upstream request override it.
+
+        :param texts: The texts to be translated.
+        :param target_language: The target language code.
+        :param source_language: The source language code. Default is 'auto'.
+        :param return_exceptions: Whether a failed string puts its exception in the result list instead of
+            raising it, so the other strings are still returned.
+        :return: The translated strings, in the order of `texts`.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.translate_str(text, target_language, source_language) for text in texts),
+                return_exceptions=return_exceptions,
+            )
+        )
+
+
+async def translate_batch(
+    service: Any,
+    texts: Sequence[str],
+    target_language: str,
+    source_language: str = "auto",
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Translate several strings with any translator service, using its `translate_batch` when it has one.
+
+    :param service: The translator service, which may only implement `translate_str`.
+    :param texts: The texts to be translated.
+    :param target_language: The target language code.
+    :param source_language: The source language code. Default is 'auto'.
+    :param return_exceptions: Whether failed strings are returned as exceptions instead of raised.
+    :return: The translated strings, in the order of `texts`.
+    """
+    if hasattr(service, "translate_batch"):
+        return list(
+            await service.translate_batch(
+                texts, target_language, source_language, return_exceptions=return_exceptions
+            )
+        )
+    return await TranslatorService.translate_batch(
+        service, texts, target_language, source_language, return_exceptions
+    )
+
+
+class TranslatorServiceError(Exception):
+    """
+    Raised when the upstream translation service answers with an error.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Union[int, None] = None,
+        retry_after: Union[float, None] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 
-class MtranslateTranslatorService:
+def is_untranslatable_error(exc: BaseException) -> bool:
+    """
+    Tell whether a failed translation was rejected for the request itself, e.g. an unsupported language or input,
+    so sending it again would fail the same way: a 400 answer. Other 4xx answers, like 401, 403 or 404, point at
+    the client's credentials or configuration rather than the request, and 429 at throttling.
+
+    :param exc: The exception a translation raised.
+    :return: Whether the request itself was rejected.
+    """
+    if isinstance(exc, TranslatorServiceError):
+        status = exc.status_code
+    elif isinstance(exc, urllib.error.HTTPError):
+        status = exc.code
+    else:
+        return False
+    return status == 400
+
+
+class MtranslateTranslatorService(TranslatorService):
     """
     Implements the BaseTranslatorService protocol using the mtranslate library
+
+    `mtranslate.translate` is a blocking HTTP call. By default it runs inline, which blocks the event loop for
+    the duration of the request. Pass `max_workers` to run every call in a dedicated thread pool instead.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_workers: Union[int, None] = None,
+        max_concurrency: Union[int, None] = None,
+        timeout: Union[float, None] = None,
+    ) -> None:
         """
         Initialize the `MtranslateTranslatorService` instance.
 
+        :param max_workers: The number of threads used to run `mtranslate` calls off the event loop.
+            If None, calls are made inline on the event loop (the legacy, blocking behaviour).
+        :param max_concurrency: The maximum number of calls allowed in flight (running or queued for a thread).
+            Callers above the cap wait on the event loop without occupying the pool. A call that timed out stays
+            in flight until its thread is done. Defaults to `max_workers`.
+        :param timeout: Per-call timeout in seconds. Only applies when `max_workers` is set.
         :raises AssertionError: If the `mtranslate` package is not installed.
+        :raises ValueError: If `max_workers` or `max_concurrency` is not positive.
         """
-        assert mtranslate, "`MtranslateTranslatorService` requires `mtranslate` package"
-        self.service = mtranslate
+        assert service_libs.mtranslate, "`MtranslateTranslatorService` requires `mtranslate` package"
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("`max_workers` must be a positive integer")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be a positive integer")
+        self.service = service_libs.mtranslate
+        self.timeout = timeout
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        self._semaphore: Union[asyncio.Semaphore, None] = None
+        self._closed = False
+        if max_workers is not None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="translategram-mtranslate"
+            )
+            self._semaphore = asyncio.Semaphore(max_concurrency or max_workers)
 
     async def translate_str(
         self, text: str, target_language: str = "auto", source_language: str = "auto"
@@ -46,6 +171,8 @@ class MtranslateTranslatorService:
         :param source_language: The source language code. Default is 'auto'.
         :return: The translated string.
         :raises TypeError: If `text`, `target_language`, or `source_language` is not a string.
+        :raises RuntimeError: If the service has been closed.
+        :raises asyncio.TimeoutError: If the call does not finish within `timeout` seconds.
         """
         if (
             not isinstance(text, str)
@@ -55,9 +182,564 @@ class MtranslateTranslatorService:
             raise TypeError(
                 "`text`, `target_language` and `source_language` must be a string"
             )
-        translated_text = self.service.translate(
-            to_translate=text,
-            to_language=target_language,
-            from_language=source_language,
-        )
+        if self._closed:
+            raise RuntimeError("`MtranslateTranslatorService` is closed")
+        if self._executor is None or self._semaphore is None:
+            translated_text = self.service.translate(
+                to_translate=text,
+                to_language=target_language,
+                from_language=source_language,
+            )
+            return str(translated_text)
+        semaphore = self._semaphore
+        loop = asyncio.get_running_loop()
+        await semaphore.acquire()
+        try:
+            future = self._executor.submit(self.service.translate, text, target_language, source_language)
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the thread is done, not when the caller stops waiting: a timed out call
+        # keeps running in its thread and still counts against `max_concurrency`.
+        future.add_done_callback(lambda _: self._release(loop, semaphore))
+        translated_text = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
         return str(translated_text)
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # The event loop is closed.
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut down the thread pool. Calls made after closing raise `RuntimeError`.
+
+        :param wait: Whether to block until the running calls have finished.
+        """
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        """
+        Shut down the thread pool without blocking the event loop.
+        """
+        self._closed = True
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+class HttpTranslatorService(TranslatorService):
+    """
+    Implements the TranslatorService protocol by calling the Google-translate style mobile endpoint
+    (`GET /m?tl=...&sl=...&q=...`, the one `mtranslate` uses) through a pooled `httpx.AsyncClient`.
+
+    The client is created on first use and shared by every call made through this instance, so connections
+    (and their TCP and TLS handshakes) are reused across all the handlers wrapped by an adapter.
+
+    `translate_batch` joins strings with newlines to translate as many of them per request as `max_batch_chars`
+    allows.
+    """
+
+    _result_expr = re.compile(r'(?s)class="(?:t0|result-container)">(.*?)<')
+    _headers = {"User-Agent": "Mozilla/4.0 (compatible; MSIE 6.0; Windows NT 5.1; SV1)"}
+
+    def __init__(
+        self,
+        base_url: str = "https://translate.google.com",
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: Union[float, None] = 30.0,
+        timeout: Union[float, None] = 10.0,
+        client: Any = None,
+        max_batch_chars: int = 1500,
+    ) -> None:
+        """
+        Initialize the `HttpTranslatorService` instance.
+
+        :param base_url: The endpoint base URL. Point it to a local stand-in server for tests and benchmarks.
+        :param max_connections: The maximum number of concurrent connections in the pool.
+        :param max_keepalive_connections: The maximum number of idle connections kept alive in the pool.
+        :param keepalive_expiry: Seconds an idle connection is kept alive. None keeps it forever.
+        :param timeout: Per-request timeout in seconds. None disables it.
+        :param client: An existing `httpx.AsyncClient` to share with other services. It is not closed by `aclose`.
+        :param max_batch_chars: The maximum length of the text sent in one `translate_batch` request.
+        :raises AssertionError: If the `httpx` package is not installed.
+        """
+        assert service_libs.httpx, "`HttpTranslatorService` requires `httpx` package"
+        self.base_url = base_url.rstrip("/")
+        self.limits = service_libs.httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self._client = client
+        self._owns_client = client is None
+        self.max_batch_chars = max_batch_chars
+
+    @property
+    def client(self) -> Any:
+        """
+        The shared `httpx.AsyncClient`, created on first access.
+        """
+        if self._client is None:
+            self._client = service_libs.httpx.AsyncClient(
+                headers=self._headers,
+                limits=self.limits,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def translate_str(
+        self, text: str, target_language: str = "auto", source_language: str = "auto"
+    ) -> str:
+        """
+        Translate the input string with a single request over the pooled client.
+
+        :param text: The text to be translated.
+        :param target_language: The target language code. Default is 'auto'.
+        :param source_language: The source language code. Default is 'auto'.
+        :return: The translated string.
+        :raises TypeError: If `text`, `target_language`, or `source_language` is not a string.
+        :raises TranslatorServiceError: If the endpoint answers with a non-2xx status.
+        """
+        if (
+            not isinstance(text, str)
+            or not isinstance(target_language, str)
+            or not isinstance(source_language, str)
+        ):
+            raise TypeError(
+                "`text`, `target_language` and `source_language` must be a string"
+            )
+        if not text:
+            return ""
+        response = await self.client.get(
+            self.base_url + "/m",
+            params={"tl": target_language, "sl": source_language, "q": text},
+        )
+        if response.status_code >= 400:
+            retry_after = response.headers.get("Retry-After", "")
+            raise TranslatorServiceError(
+                f"Translation request failed with status {response.status_code}",
+                status_code=response.status_code,
+                retry_after=float(retry_after) if retry_after.isdigit() else None,
+            )
+        match = self._result_expr.search(response.text)
+        return html.unescape(match.group(1)) if match else ""
+
+    async def translate_batch(
+        self,
+        texts: Sequence[str],
+        target_language: str = "auto",
+        source_language: str = "auto",
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Translate several strings, packing them into as few requests as `max_batch_chars` allows.
+
+        Strings are joined with newlines and the response is split on them again. Strings that contain a newline
+        or reach the size limit on their own are sent alone. If a packed request fails, or its response does not
+        split back into as many lines, its strings are retried one by one, so one bad string does not fail the
+        others.
+
+        :param texts: The texts to be translated.
+        :param target_language: The target language code. Default is 'auto'.
+        :param source_language: The source language code. Default is 'auto'.
+        :param return_exceptions: Whether a failed string puts its exception in the result list instead of
+            raising it.
+        :return: The translated strings, in the order of `texts`.
+        :raises TypeError: If any text, `target_language`, or `source_language` is not a string.
+        """
+        if not all(isinstance(text, str) for text in texts):
+            raise TypeError("`texts` must be a sequence of strings")
+        results: List[Any] = [""] * len(texts)
+        chunks: List[List[int]] = []
+        chunk: List[int] = []
+        chunk_size = 0
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            if "\n" in text or len(text) >= self.max_batch_chars:
+                chunks.append([i])
+                continue
+            if chunk and chunk_size + len(text) + 1 > self.max_batch_chars:
+                chunks.append(chunk)
+                chunk, chunk_size = [], 0
+            chunk.append(i)
+            chunk_size += len(text) + 1
+        if chunk:
+            chunks.append(chunk)
+        await asyncio.gather(
+            *(
+                self._translate_chunk(texts, chunk, target_language, source_language, results, return_exceptions)
+                for chunk in chunks
+            )
+        )
+        return results
+
+    async def _translate_chunk(
+        self,
+        texts: Sequence[str],
+        chunk: List[int],
+        target_language: str,
+        source_language: str,
+        results: List[Any],
+        return_exceptions: bool,
+    ) -> None:
+        """
+        Translate the strings at the `chunk` indices of `texts` into `results`, with one request if possible.
+        """
+        if len(chunk) > 1:
+            try:
+                translated = await self.translate_str(
+                    "\n".join(texts[i] for i in chunk), target_language, source_language
+                )
+            except Exception:
+                pass
+            else:
+                lines = translated.split("\n")
+                if len(lines) == len(chunk):
+                    for i, line in zip(chunk, lines):
+                        results[i] = line
+                    return
+        translations = await asyncio.gather(
+            *(self.translate_str(texts[i], target_language, source_language) for i in chunk),
+            return_exceptions=return_exceptions,
+        )
+        for i, translation in zip(chunk, translations):
+            results[i] = translation
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled client, unless it was passed in by the caller.
+        """
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+
+class RateLimitedTranslatorService(TranslatorService):
+    """
+    Wraps any translator service with a token-bucket rate limiter and retries with jittered exponential backoff.
+
+    Calls wait for a token in a queue per target language, and tokens are handed to the languages in turn, so a
+    burst of requests for one language cannot starve the others. Throttling (HTTP 429) halves the request rate,
+    which then grows back by `rate / 10` per successful call. `TranslatorServiceError`s with status 429 or 5xx,
+    connection errors and timeouts are retried; other errors are raised right away.
+    """
+
+    def __init__(
+        self,
+        service: TranslatorService,
+        rate: float = 5.0,
+        burst: int = 5,
+        min_rate: Union[float, None] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ) -> None:
+        """
+        Initialize the `RateLimitedTranslatorService` instance.
+
+        :param service: The translator service to wrap.
+        :param rate: The number of calls per second allowed to reach the service.
+        :param burst: The number of calls allowed through at once after an idle period.
+        :param min_rate: The lowest rate throttling can bring the limiter down to. Defaults to `rate / 10`.
+        :param max_retries: The number of times a failed call is retried.
+        :param base_delay: The backoff before the first retry, in seconds. It doubles with every retry.
+        :param max_delay: The upper bound of a single backoff, in seconds.
+        :raises ValueError: If `rate` or `burst` is not positive, or `max_retries` is negative.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("`rate` and `burst` must be positive")
+        if max_retries < 0:
+            raise ValueError("`max_retries` must not be negative")
+        self.service = service
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.current_rate = rate
+        self._tokens = float(burst)
+        self._updated_at: Union[float, None] = None
+        self._queues: "OrderedDict[str, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._dispatcher: Union["asyncio.Task[None]", None] = None
+        self._closed = False
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of calls waiting for a token.
+        """
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def average_wait(self) -> float:
+        """
+        The average time, in seconds, a call waited for a token.
+        """
+        return self.total_wait / self.calls if self.calls else 0.0
+
+    def _refill(self, now: float) -> None:
+        if self._updated_at is not None:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.current_rate)
+        self._updated_at = now
+
+    async def _dispatch(self) -> None:
+        """
+        Hand out tokens to the queued calls, one target language at a time, until the queues are empty.
+        """
+        loop = asyncio.get_running_loop()
+        while self._queues:
+            self._refill(loop.time())
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.current_rate)
+                continue
+            language, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(language)
+            else:
+                del self._queues[language]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._tokens -= 1
+
+    async def _acquire(self, target_language: str) -> None:
+        """
+        Wait for a token in the queue of `target_language`.
+        """
+        if self._closed:
+            raise RuntimeError("`RateLimitedTranslatorService` is closed")
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        waiter = loop.create_future()
+        self._queues.setdefault(target_language, deque()).append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await waiter
+        waited = loop.time() - started_at
+        self.calls += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    @staticmethod
+    def _is_retryable(exc: BaseException) -> bool:
+        if isinstance(exc, TranslatorServiceError):
+            return exc.status_code is None or exc.status_code == 429 or exc.status_code >= 500
+        if isinstance(exc, urllib.error.HTTPError):
+            return exc.code == 429 or exc.code >= 500
+        httpx = sys.modules.get("httpx")
+        if httpx is not None and isinstance(exc, httpx.TransportError):
+            return True
+        return isinstance(exc, (OSError, asyncio.TimeoutError))
+
+    @staticmethod
+    def _is_throttled(exc: BaseException) -> bool:
+        if isinstance(exc, TranslatorServiceError):
+            return exc.status_code == 429
+        return isinstance(exc, urllib.error.HTTPError) and exc.code == 429
+
+    async def translate_str(
+        self, text: str, target_language: str = "auto", source_language: str = "auto"
+    ) -> str:
+        """
+        Translate the input string with the wrapped service once a token is available, retrying failed calls.
+
+        :param text: The text to be translated.
+        :param target_language: The target language code. Default is 'auto'.
+        :param source_language: The source language code. Default is 'auto'.
+        :return: The translated string.
+        :raises Exception: The last error of the wrapped service once the retries are used up.
+        :raises RuntimeError: If the service is closed, or closed while the call waits for a token.
+        """
+        attempt = 0
+        while True:
+            await self._acquire(target_language)
+            try:
+                translated = await self.service.translate_str(text, target_language, source_language)
+            except Exception as exc:
+                if self._is_throttled(exc):
+                    self.throttled += 1
+                    self.current_rate = max(self.min_rate, self.current_rate / 2)
+                if attempt >= self.max_retries or not self._is_retryable(exc):
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+                retry_after = getattr(exc, "retry_after", None)
+                if retry_after is not None:
+                    delay = max(delay, min(self.max_delay, retry_after))
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+            else:
+                self.current_rate = min(self.rate, self.current_rate + self.rate / 10)
+                return translated
+
+    async def aclose(self) -> None:
+        """
+        Stop handing out tokens, fail the calls still waiting for one with `RuntimeError` and close the wrapped
+        service.
+        """
+        self._closed = True
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for queue in self._queues.values():
+            for waiter in queue:
+                if not waiter.done():
+                    waiter.set_exception(RuntimeError("`RateLimitedTranslatorService` is closed"))
+        self._queues.clear()
+        aclose = getattr(self.service, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class FallbackTranslatorService(TranslatorService):
+    """
+    Composite translator service trying an ordered list of services, with hedged requests.
+
+    Every call starts with the first service. If it fails, the next service is tried right away. If it has not
+    answered by the hedge deadline, the next service is started too and whichever answers first wins; the calls
+    still running are cancelled. The deadline is the 95th percentile of the first service's recent latencies, so
+    only the slowest calls get hedged.
+
+    `hedges`, `fallbacks` and `wins` (one counter per service) show how often each path is taken.
+    """
+
+    def __init__(
+        self,
+        services: Sequence[TranslatorService],
+        hedge_delay: Union[float, None] = None,
+        initial_hedge_delay: float = 1.0,
+        min_hedge_delay: float = 0.05,
+        max_hedge_delay: float = 10.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        """
+        Initialize the `FallbackTranslatorService` instance.
+
+        :param services: The services to use, in order of preference.
+        :param hedge_delay: A fixed hedge deadline in seconds. If None, the deadline follows the p95 latency.
+        :param initial_hedge_delay: The deadline used until `min_samples` latencies have been observed.
+        :param min_hedge_delay: The lower bound of the p95-based deadline.
+        :param max_hedge_delay: The upper bound of the p95-based deadline.
+        :param window: The number of recent latencies of the first service the p95 is computed over.
+        :param min_samples: The number of latencies needed before the p95 is used.
+        :raises ValueError: If `services` is empty.
+        """
+        if not services:
+            raise ValueError("`services` must not be empty")
+        self.services = list(services)
+        self.fixed_hedge_delay = hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.fallbacks = 0
+        self.wins = [0] * len(self.services)
+
+    @property
+    def hedge_delay(self) -> float:
+        """
+        The current hedge deadline in seconds.
+        """
+        if self.fixed_hedge_delay is not None:
+            return self.fixed_hedge_delay
+        if len(self._latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        latencies = sorted(self._latencies)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    @property
+    def hedge_rate(self) -> float:
+        """
+        The share of calls that sent a hedged request.
+        """
+        return self.hedges / self.calls if self.calls else 0.0
+
+    @property
+    def win_rates(self) -> List[float]:
+        """
+        The share of calls answered by each service.
+        """
+        return [wins / self.calls if self.calls else 0.0 for wins in self.wins]
+
+    async def translate_str(
+        self, text: str, target_language: str = "auto", source_language: str = "auto"
+    ) -> str:
+        """
+        Translate the input string with the first service that answers successfully.
+
+        :param text: The text to be translated.
+        :param target_language: The target language code. Default is 'auto'.
+        :param source_language: The source language code. Default is 'auto'.
+        :return: The translated string.
+        :raises Exception: The error of the last service if every service failed.
+        """
+        loop = asyncio.get_running_loop()
+        pending: Set["asyncio.Future[str]"] = set()
+        attempts: Dict["asyncio.Future[str]", Tuple[int, float]] = {}
+        next_index = 0
+        last_error: Union[BaseException, None] = None
+
+        def start_next() -> None:
+            nonlocal next_index
+            service = self.services[next_index]
+            attempt = asyncio.ensure_future(service.translate_str(text, target_language, source_language))
+            attempts[attempt] = (next_index, loop.time())
+            pending.add(attempt)
+            next_index += 1
+
+        self.calls += 1
+        start_next()
+        primary = next(iter(pending))
+        try:
+            while pending:
+                timeout = self.hedge_delay if next_index < len(self.services) else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    start_next()
+                    continue
+                # Every error is retrieved, even when another attempt wins in the same round.
+                errors = {attempt: attempt.exception() for attempt in sorted(done, key=lambda a: attempts[a][0])}
+                for attempt, error in errors.items():
+                    if error is None:
+                        if attempt is primary or not primary.done():
+                            # A first service still running counts with its latency so far, a lower bound.
+                            self._latencies.append(loop.time() - attempts[primary][1])
+                        self.wins[attempts[attempt][0]] += 1
+                        return attempt.result()
+                for error in errors.values():
+                    last_error = error
+                    if next_index < len(self.services):
+                        self.fallbacks += 1
+                        start_next()
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+        assert last_error is not None
+        raise last_error
+
+    async def aclose(self) -> None:
+        """
+        Close every wrapped service that has an `aclose` method.
+        """
+        for service in self.services:
+            aclose = getattr(service, "aclose", None)
+            if aclose is not None:
+                await aclose()